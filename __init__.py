@@ -2,70 +2,193 @@
 
 import json
 import logging
+import time
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.components.webhook import async_register as async_register_webhook
-
-from .const import DOMAIN, CONF_HOST, CONF_USERNAME, CONF_PASSWORD, CONF_VERIFY_SSL, DEFAULT_HOST
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.typing import ConfigType
+
+from .const import (
+    DOMAIN,
+    CONF_HOST,
+    CONF_USERNAME,
+    CONF_PASSWORD,
+    CONF_VERIFY_SSL,
+    CONF_ENABLE_CAMERA,
+    CONF_CAMERA_PROFILES,
+    CONF_RTSP_TRANSPORT,
+    CONF_STREAM_PREWARM,
+    CONF_STREAM_PREWARM_WINDOW,
+    CONF_DOOR_CHANNELS,
+    DEFAULT_HOST,
+)
 from .client import IntelbrasClient
-from .coordinator import IntelbrasEventsCoordinator
+from .coordinator import IntelbrasEventsCoordinator, get_entry_settings
+from .services import async_setup_services
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
-PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.CAMERA, Platform.BUTTON]
+PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.BINARY_SENSOR, Platform.BUTTON]
 
 # Set up a logger for your custom component
 _LOGGER = logging.getLogger(__name__)
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Intelbras 3542 MFW services."""
+    await async_setup_services(hass)
+    return True
+
+
+def get_platforms(entry: ConfigEntry) -> list[Platform]:
+    """Return the platforms enabled for a config entry.
+
+    Sensors, binary sensors and buttons are always set up; the camera is opt-in since it is
+    the most expensive platform to run.
+    """
+    platforms = list(PLATFORMS)
+    if get_entry_settings(entry).get(CONF_ENABLE_CAMERA, False):
+        platforms.append(Platform.CAMERA)
+    return platforms
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Intelbras 3542 MFW from a config entry."""
+    started = time.monotonic()
     hass.data.setdefault(DOMAIN, {})
 
     # Get configuration from the config entry
+    settings = get_entry_settings(entry)
     host = entry.data.get(CONF_HOST, DEFAULT_HOST)
     username = entry.data.get(CONF_USERNAME)
     password = entry.data.get(CONF_PASSWORD)
-    verify_ssl = entry.data.get(CONF_VERIFY_SSL, False)
+    verify_ssl = settings.get(CONF_VERIFY_SSL, False)
 
     # Create the client instance
     client = IntelbrasClient(host, username, password, verify_ssl)
-
-    # Create and setup the events coordinator
-    coordinator = IntelbrasEventsCoordinator(hass, entry, client)
-
-    # Perform the initial refresh to set up the coordinator
-    await coordinator.async_config_entry_first_refresh()
-
-    # Store the coordinator in hass.data for access by platforms
-    hass.data[DOMAIN][entry.entry_id] = {
-        "coordinator": coordinator,
-        "client": client
-    }
-
-    # Set up platforms
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-
+    entities_loaded = CONF_DOOR_CHANNELS in entry.data
+    try:
+        await client.apply_settings(settings)
+
+        # Create and setup the events coordinator
+        coordinator = IntelbrasEventsCoordinator(hass, entry, client)
+
+        # Once the door channels are known from a previous run, entities can be
+        # created right away from restored state and the first refresh moved to
+        # the background, so a slow terminal doesn't hold up startup.
+        if not entities_loaded:
+            await coordinator.async_start()
+
+        platforms = get_platforms(entry)
+
+        # Store the coordinator in hass.data for access by platforms
+        hass.data[DOMAIN][entry.entry_id] = {
+            "coordinator": coordinator,
+            "client": client,
+            "platforms": platforms,
+            "camera_settings": _camera_settings(settings),
+        }
+
+        # Set up platforms
+        await hass.config_entries.async_forward_entry_setups(entry, platforms)
+    except Exception:
+        # Setup is retried with a new client; close this one's session
+        hass.data[DOMAIN].pop(entry.entry_id, None)
+        await client.close()
+        raise
+
+    # Track availability with a cheap probe, separate from the event poll
+    entry.async_on_unload(coordinator.async_start_probe())
+
+    # Options are applied in place; see _async_apply_options
+    entry.async_on_unload(entry.add_update_listener(_async_apply_options))
+
+    if entities_loaded:
+        entry.async_create_background_task(
+            hass,
+            coordinator.async_start(entities_loaded=True),
+            f"{DOMAIN}_first_refresh_{entry.entry_id}",
+        )
+
+    setup_duration = time.monotonic() - started
+    hass.data[DOMAIN][entry.entry_id]["setup_duration"] = setup_duration
     _LOGGER.info(
-        "Intelbras 3542 MFW integration successfully set up with events coordinator")
+        "Intelbras 3542 MFW integration successfully set up with events coordinator in %.2fs",
+        setup_duration)
 
     return True
 
 
+def _camera_settings(settings) -> tuple:
+    """Return the settings the camera entities are built from."""
+    return (
+        tuple(settings.get(CONF_CAMERA_PROFILES) or ()),
+        settings.get(CONF_RTSP_TRANSPORT),
+        settings.get(CONF_VERIFY_SSL, False),
+        settings.get(CONF_STREAM_PREWARM, False),
+        settings.get(CONF_STREAM_PREWARM_WINDOW),
+    )
+
+
+async def _async_apply_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed settings to the running entry without reloading it.
+
+    The client and coordinator are tuned in place, so polling continues
+    from the same query window. Only platforms that were enabled or
+    disabled, and the camera when its stream settings changed, are set up
+    or unloaded. Also runs on data updates, such as remembered door
+    channels; applying unchanged settings is a no-op.
+    """
+    async with entry.setup_lock:
+        data = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+        if data is None:
+            # Unloaded or reloading meanwhile; setup reads the new settings
+            return
+
+        settings = get_entry_settings(entry)
+        await data["client"].apply_settings(settings)
+        data["coordinator"].apply_settings(settings)
+
+        platforms = get_platforms(entry)
+        removed = [platform for platform in data["platforms"] if platform not in platforms]
+        added = [platform for platform in platforms if platform not in data["platforms"]]
+        camera_settings = _camera_settings(settings)
+        if (
+            camera_settings != data["camera_settings"]
+            and Platform.CAMERA in platforms
+            and Platform.CAMERA not in added
+        ):
+            removed.append(Platform.CAMERA)
+            added.append(Platform.CAMERA)
+        data["camera_settings"] = camera_settings
+
+        if removed:
+            await hass.config_entries.async_unload_platforms(entry, removed)
+        if added:
+            await hass.config_entries.async_forward_entry_setups(entry, added)
+        data["platforms"] = platforms
+        _LOGGER.debug("Applied options to %s in place (platforms added %s, removed %s)",
+                      entry.title, added, removed)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload Intelbras 3542 MFW config entry."""
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    platforms = hass.data[DOMAIN][entry.entry_id]["platforms"]
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, platforms)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        await data["client"].close()
     return unload_ok
 
 
 async def async_migrate_entry(hass, entry):
     """Migrate config entry to a new version."""
-    # Example migration logic
-    # if entry.version == 1:
-    #     entry.data["new_key"] = "new_value"
-    #     entry.version = 2
-    #     hass.config_entries.async_update_entry(entry)
-    # return True
+    if entry.version == 1:
+        # The camera became opt-in in version 2; keep it for existing entries
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_ENABLE_CAMERA: True}, version=2
+        )
     return True
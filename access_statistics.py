@@ -0,0 +1,202 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Optional
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN
+from .event_parser import event_channel, event_matches
+
+_LOGGER = logging.getLogger(__name__)
+
+HOUR = 3600
+
+
+def _hour_start(timestamp: int) -> int:
+    """Return the start of the hour containing timestamp."""
+    return timestamp - timestamp % HOUR
+
+
+class IntelbrasAccessStatistics:
+    """Aggregate access events into hourly counts and import them as external statistics.
+
+    Counts are kept per hour for entries, denials (total and per ErrorCode),
+    entry Method and door channel. An hour is imported once it is complete,
+    meaning the coordinator's query window has moved past its end, so its
+    counts never change afterwards and the cumulative sums stay consistent.
+    """
+
+    def __init__(self, hass: HomeAssistant, host: str, title: str):
+        """Initialize the aggregator."""
+        self.hass = hass
+        self.title = title
+        self._prefix = f"{DOMAIN}:{slugify(host)}"
+        # hour start -> statistic key -> count
+        self._buckets: Dict[int, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        # statistic key -> last imported cumulative sum
+        self._sums: Dict[str, float] = {}
+        self.flushed_until: Optional[int] = None
+        # Held by imports; live flushes skip while a backfill holds it
+        self._import_lock = asyncio.Lock()
+        self._backfilling = False
+
+    @staticmethod
+    def _event_keys(event: Dict[str, Any]) -> Iterable[str]:
+        """Return the statistic keys an event counts towards."""
+        error_code = event.get("ErrorCode", 0)
+        if error_code:
+            yield "denied"
+            yield f"denied_{error_code}"
+        elif event.get("Type") == "Entry":
+            yield "entries"
+        if event.get("Method") not in (None, ""):
+            # Method ends up in the statistic id, which only allows slug characters
+            yield f"method_{slugify(str(event['Method']))}"
+        yield f"door_{event_channel(event)}"
+
+    def add_events(self, events: Iterable[Dict[str, Any]]) -> None:
+        """Count events into their hourly buckets."""
+        if "recorder" not in self.hass.config.components:
+            return
+        self._add_events(self._buckets, events)
+
+    def _add_events(self, buckets, events: Iterable[Dict[str, Any]]) -> None:
+        for event in events:
+            create_time = event.get("CreateTime")
+            if not isinstance(create_time, int):
+                continue
+            bucket = buckets[_hour_start(create_time)]
+            for key in self._event_keys(event):
+                bucket[key] += 1
+
+    async def async_flush(self, until: int) -> None:
+        """Import every bucket whose hour ended at or before until.
+
+        While a backfill runs, completed hours stay buffered and are imported
+        by the next flush, on top of the backfilled sums.
+        """
+        if "recorder" not in self.hass.config.components or self._import_lock.locked():
+            return
+        async with self._import_lock:
+            complete = {
+                hour: counts for hour, counts in self._buckets.items() if hour + HOUR <= until
+            }
+            if complete:
+                await self._async_import(complete)
+                for hour in complete:
+                    del self._buckets[hour]
+            self.flushed_until = _hour_start(until)
+
+    async def async_backfill(
+        self, client, start_time: int, conditions: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """Rebuild the statistics from the device history since start_time.
+
+        The backfill ends where the live aggregation has imported up to and
+        restarts the cumulative sums from zero at start_time, so live hours
+        keep adding onto the backfilled sums. Live flushes are held back
+        until it finishes. Records are filtered with the same conditions as
+        the live events. Returns the records counted.
+        """
+        if "recorder" not in self.hass.config.components:
+            raise RuntimeError("The recorder integration is not loaded")
+        if self._backfilling:
+            raise RuntimeError("A statistics backfill is already running")
+        conditions = conditions or {}
+
+        self._backfilling = True
+        try:
+            return await self._async_backfill(client, start_time, conditions)
+        finally:
+            self._backfilling = False
+
+    async def _async_backfill(self, client, start_time: int, conditions: Dict[str, Any]) -> int:
+        async with self._import_lock:
+            end_time = self.flushed_until or _hour_start(client.clock.device_time())
+            start_time = _hour_start(start_time)
+            if start_time >= end_time:
+                raise RuntimeError(
+                    f"Nothing to backfill: start_time must be before "
+                    f"{dt_util.utc_from_timestamp(end_time).isoformat()}, where the live statistics begin"
+                )
+
+            buckets: Dict[int, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+            records = 0
+            async for page in client.iter_event_pages(
+                start_time, end_time - 1, conditions=conditions
+            ):
+                # Firmware that ignores a condition still only counts matching events
+                page = [event for event in page if event_matches(event, conditions)]
+                self._add_events(buckets, page)
+                records += len(page)
+
+            await self._async_import(buckets, restart_sums=True)
+        _LOGGER.info("Backfilled %d records into hourly statistics for %s", records, self.title)
+        return records
+
+    async def _async_load_sum(self, key: str) -> float:
+        """Return the last cumulative sum of a statistic from the recorder."""
+        statistic_id = f"{self._prefix}_{key}"
+        last = await get_instance(self.hass).async_add_executor_job(
+            get_last_statistics, self.hass, 1, statistic_id, True, {"sum"}
+        )
+        if last.get(statistic_id):
+            return last[statistic_id][0].get("sum") or 0.0
+        return 0.0
+
+    async def _async_import(
+        self, buckets: Dict[int, Dict[str, int]], restart_sums: bool = False
+    ) -> None:
+        """Import hourly counts, one bulk call per statistic.
+
+        With restart_sums, every sum restarts from zero at the first bucket
+        instead of continuing from the last imported one.
+
+        The new sums are kept aside and only replace self._sums once every
+        statistic was handed to the recorder. If an import fails or is
+        cancelled, the buckets stay queued and are imported again from the
+        same sums, which overwrites the same hours instead of counting them
+        twice.
+        """
+        keys = {key for counts in buckets.values() for key in counts}
+        sums = {}
+        for key in sorted(keys):
+            if restart_sums:
+                sums[key] = 0.0
+            elif key in self._sums:
+                sums[key] = self._sums[key]
+            else:
+                sums[key] = await self._async_load_sum(key)
+
+        for key in sorted(keys):
+            statistics = []
+            for hour in sorted(buckets):
+                count = buckets[hour].get(key, 0)
+                if not count:
+                    continue
+                sums[key] += count
+                statistics.append({
+                    "start": dt_util.utc_from_timestamp(hour),
+                    "state": count,
+                    "sum": sums[key],
+                })
+
+            metadata = {
+                "has_mean": False,
+                "has_sum": True,
+                "name": f"{self.title} {key.replace('_', ' ')}",
+                "source": DOMAIN,
+                "statistic_id": f"{self._prefix}_{key}",
+                "unit_of_measurement": None,
+            }
+            async_add_external_statistics(self.hass, metadata, statistics)
+        if restart_sums:
+            self._sums = {key: 0.0 for key in self._sums}
+        self._sums.update(sums)
@@ -0,0 +1,56 @@
+import logging
+
+from homeassistant.components.binary_sensor import BinarySensorDeviceClass, BinarySensorEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN, CONF_HOST, DEFAULT_HOST
+from .coordinator import get_device_link
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up the binary sensor platform from a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    host = entry.data.get(CONF_HOST, DEFAULT_HOST)
+
+    async_add_entities([IntelbrasConnectivitySensor(coordinator, host)])
+
+
+class IntelbrasConnectivitySensor(BinarySensorEntity):
+    """Device reachability as seen by the lightweight availability probe."""
+
+    _attr_should_poll = False
+    _attr_device_class = BinarySensorDeviceClass.CONNECTIVITY
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator, host):
+        """Initialize the sensor."""
+        self.coordinator = coordinator
+        self._attr_name = "Connectivity"
+        self._attr_unique_id = f"{host}_connectivity"
+        self._attr_device_info = get_device_link(host)
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to probe results."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_probe_listener(self._handle_probe_update)
+        )
+
+    @callback
+    def _handle_probe_update(self) -> None:
+        """Write the new probe result."""
+        self.async_write_ha_state()
+
+    @property
+    def is_on(self) -> bool:
+        """Return whether the device is reachable."""
+        return self.coordinator.device_available
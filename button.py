@@ -1,12 +1,12 @@
 import logging
 
 from homeassistant.components.button import ButtonEntity
-from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN, CONF_HOST
+from .coordinator import get_device_link
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,39 +23,59 @@ async def async_setup_entry(
     
     host = entry.data.get(CONF_HOST)
     
-    async_add_entities([IntelbrasDoorButton(coordinator, client, host)])
+    async_add_entities([
+        IntelbrasDoorButton(coordinator, client, host, channel)
+        for channel in coordinator.channels
+    ])
 
 
 class IntelbrasDoorButton(ButtonEntity):
     """Representation of a door button to open the door via the device API."""
 
-    def __init__(self, coordinator, client, host):
+    def __init__(self, coordinator, client, host, channel: int = 1):
         """Initialize the door button."""
         self._client = client
         self._host = host
         self._coordinator = coordinator
-        self._channel = 1  # For devices with a single door, channel is always 1.
-
-        self._attr_name = "Open Door"
-        self._attr_unique_id = f"{host}_door_button"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, host)},
-            name="Intelbras 3542 MFW Door Controller",
-            manufacturer="Intelbras",
-            model="3542 MFW",
-            configuration_url=host,
+        self._channel = channel
+
+        # Channel 1 keeps the original single-door name and unique id
+        if channel == 1:
+            self._attr_name = "Open Door"
+            self._attr_unique_id = f"{host}_door_button"
+        else:
+            self._attr_name = f"Open Door {channel}"
+            self._attr_unique_id = f"{host}_door_button_{channel}"
+        self._attr_device_info = get_device_link(host)
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the coordinator so availability changes are written."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._coordinator.async_add_listener(self.async_write_ha_state)
         )
 
+    @property
+    def available(self) -> bool:
+        """Unavailable while the probe finds the device offline."""
+        return self._coordinator.device_available
+
     async def async_press(self) -> None:
         """Handle the button press to open the door."""
-        _LOGGER.debug("Opening door via button press")
+        _LOGGER.debug("Opening door channel %s via button press", self._channel)
         try:
             # Use the async client method directly
             response = await self._client.open_door(self._channel)
             _LOGGER.info("Door opened successfully: %s", response)
 
-            # Refresh the coordinator data
-            await self._coordinator.async_refresh()
+            # Show the door as open right away, then confirm with a single
+            # door status read instead of a full events refresh
+            self._coordinator.async_set_door_status("open", self._channel)
+            self._coordinator.config_entry.async_create_background_task(
+                self.hass,
+                self._coordinator.async_recheck_door_status(self._channel),
+                f"{DOMAIN} door status re-check",
+            )
         except Exception as exc:
             _LOGGER.error("Error opening door: %s", exc)
             raise
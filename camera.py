@@ -1,69 +1,164 @@
 import logging
+import shlex
+from typing import Any, Dict, Optional
 from urllib.parse import urlparse, quote_plus
 
 from homeassistant.components.camera import Camera, CameraEntityFeature
+from homeassistant.components.ffmpeg import async_get_image
+from homeassistant.components.stream import CONF_RTSP_TRANSPORT as STREAM_RTSP_TRANSPORT
+from homeassistant.core import callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, CONF_HOST, CONF_USERNAME, CONF_PASSWORD, DEFAULT_HOST, CONF_VERIFY_SSL
+from .const import (
+    DOMAIN,
+    CONF_HOST,
+    CONF_USERNAME,
+    CONF_PASSWORD,
+    DEFAULT_HOST,
+    CONF_VERIFY_SSL,
+    CONF_CAMERA_PROFILES,
+    CONF_RTSP_TRANSPORT,
+    CONF_STREAM_PREWARM,
+    CONF_STREAM_PREWARM_WINDOW,
+    DEFAULT_CAMERA_PROFILES,
+    DEFAULT_RTSP_TRANSPORT,
+    DEFAULT_STREAM_PREWARM_WINDOW,
+    STREAM_PROFILE_MAIN,
+    STREAM_PROFILE_SUB,
+    STREAM_PROFILE_SUBTYPES,
+)
+from .coordinator import get_device_link, get_entry_settings
+from .stream_warmer import get_stream_warmer
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def get_rtsp_url(host: str, username: str, password: str, verify_ssl: bool) -> str:
+def get_rtsp_url(
+    host: str,
+    username: str,
+    password: str,
+    verify_ssl: bool,
+    channel: int = 1,
+    profile: str = STREAM_PROFILE_MAIN,
+) -> str:
     """
     Generate the RTSP URL for the camera feed.
 
     Uses 'rtsps' if verify_ssl is True or the host uses HTTPS; otherwise 'rtsp'.
     URL-encodes the username and password to support special characters.
+    The profile selects the main (full resolution) or sub (low bitrate) stream.
     """
     parsed = urlparse(host)
     netloc = parsed.netloc if parsed.netloc else parsed.path
     username_encoded = quote_plus(username) if username else ""
     password_encoded = quote_plus(password) if password else ""
     protocol = "rtsps" if verify_ssl or parsed.scheme == "https" else "rtsp"
-    return f"{protocol}://{username_encoded}:{password_encoded}@{netloc}:554"
+    subtype = STREAM_PROFILE_SUBTYPES[profile]
+    return (
+        f"{protocol}://{username_encoded}:{password_encoded}@{netloc}:554"
+        f"/cam/realmonitor?channel={channel}&subtype={subtype}"
+    )
 
 
 async def async_setup_entry(hass, entry, async_add_entities: AddEntitiesCallback):
     """Set up the Intelbras camera platform from a config entry."""
+    settings = get_entry_settings(entry)
     host = entry.data.get(CONF_HOST, DEFAULT_HOST)
     username = entry.data.get(CONF_USERNAME)
     password = entry.data.get(CONF_PASSWORD)
-    verify_ssl = entry.data.get(CONF_VERIFY_SSL, False)
-
-    async_add_entities([IntelbrasCamera(host, username, password, verify_ssl)])
+    verify_ssl = settings.get(CONF_VERIFY_SSL, False)
+    profiles = settings.get(CONF_CAMERA_PROFILES, DEFAULT_CAMERA_PROFILES)
+    rtsp_transport = settings.get(CONF_RTSP_TRANSPORT, DEFAULT_RTSP_TRANSPORT)
+    prewarm_window = (
+        settings.get(CONF_STREAM_PREWARM_WINDOW, DEFAULT_STREAM_PREWARM_WINDOW)
+        if settings.get(CONF_STREAM_PREWARM, False) else None
+    )
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    # One camera entity per selected stream profile; only the first one is
+    # pre-warmed, so an event holds a single stream per terminal
+    async_add_entities([
+        IntelbrasCamera(
+            host, username, password, verify_ssl, profile, rtsp_transport,
+            coordinator=coordinator,
+            prewarm_window=prewarm_window if index == 0 else None,
+        )
+        for index, profile in enumerate(profiles)
+    ])
 
 
 class IntelbrasCamera(Camera):
     """Representation of an Intelbras RTSP Camera."""
 
-    def __init__(self, host: str, username: str, password: str, verify_ssl: bool):
+    def __init__(
+        self,
+        host: str,
+        username: str,
+        password: str,
+        verify_ssl: bool,
+        profile: str = STREAM_PROFILE_MAIN,
+        rtsp_transport: str = DEFAULT_RTSP_TRANSPORT,
+        coordinator=None,
+        prewarm_window: Optional[int] = None,
+    ):
         """Initialize the camera."""
         super().__init__()
         self._host = host
+        self._coordinator = coordinator
+        self._prewarm_window = prewarm_window
         self._username = username
         self._password = password
         self.verify_ssl = verify_ssl
+        self._profile = profile
 
-        self._attr_name = "Intelbras Camera"
-        self._attr_unique_id = f"{host}_camera"
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, host)},
-            "name": "Intelbras 3542 MFW Camera",
-            "manufacturer": "Intelbras",
-            "configuration_url": host,
-        }
+        # The main stream keeps the original name and unique id
+        if profile == STREAM_PROFILE_MAIN:
+            self._attr_name = "Intelbras Camera"
+            self._attr_unique_id = f"{host}_camera"
+        else:
+            self._attr_name = f"Intelbras Camera {profile.capitalize()} Stream"
+            self._attr_unique_id = f"{host}_camera_{profile}"
+        self._attr_device_info = get_device_link(host)
 
         # Build the RTSP URL with proper credentials and protocol.
-        self._rtsp_url = get_rtsp_url(host, username, password, verify_ssl)
+        self._rtsp_url = get_rtsp_url(host, username, password, verify_ssl, profile=profile)
+        # Stills always come from the low-bitrate sub stream, so thumbnail
+        # cards never decode the full-resolution main stream.
+        self._still_url = get_rtsp_url(host, username, password, verify_ssl, profile=STREAM_PROFILE_SUB)
 
         # Advertise streaming support.
         self._attr_supported_features = CameraEntityFeature.STREAM
 
-        # Configure ffmpeg stream options: disable TLS verification if verify_ssl is False.
-        # self.stream_options = {}
-        # if not verify_ssl:
-        #     self.stream_options["-tls_verify"] = "0"
+        # RTSP over TCP or UDP for the HA stream worker.
+        self.stream_options[STREAM_RTSP_TRANSPORT] = rtsp_transport
+        self._rtsp_transport = rtsp_transport
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the terminal's access events when pre-warming is enabled."""
+        await super().async_added_to_hass()
+        if self._prewarm_window and self._coordinator is not None:
+            self.async_on_remove(
+                self._coordinator.async_add_event_listener(self._async_handle_access_event)
+            )
+
+    @callback
+    def _async_handle_access_event(self, event: Dict[str, Any]) -> None:
+        """Warm the stream on a fresh Entry or denied access event."""
+        if event.get("Type") != "Entry" and not event.get("ErrorCode"):
+            return
+        # Skip old records fired by a backfill after a restart or outage
+        create_time = event.get("CreateTime")
+        device_time = self._coordinator.client.clock.device_time()
+        if not isinstance(create_time, int) or device_time - create_time > self._prewarm_window:
+            return
+        self.hass.async_create_task(
+            get_stream_warmer(self.hass).async_warm(self, self._prewarm_window)
+        )
+
+    @property
+    def extra_state_attributes(self):
+        """Return the stream profile of this camera."""
+        return {"stream_profile": self._profile}
 
     async def stream_source(self) -> str:
         """Return the RTSP stream URL."""
@@ -73,11 +168,16 @@ class IntelbrasCamera(Camera):
         """
         Return a still image from the camera.
 
-        Returning None lets Home Assistant's built-in ffmpeg integration use
-        the stream_source for live viewing.
+        Grabs a single frame from the sub stream with ffmpeg, over the
+        configured RTSP transport.
         """
-        return None
+        # -rtsp_transport is an input option, so it has to precede -i; haffmpeg
+        # puts a multi-word input source as-is before the output options,
+        # whereas extra_cmd would land after the input and be ignored
+        input_source = f"-rtsp_transport {self._rtsp_transport} -i {shlex.quote(self._still_url)}"
+        return await async_get_image(self.hass, input_source, width=width, height=height)
 
+    @property
     def use_stream_for_stills(self) -> bool:
         """Whether or not to use stream to generate stills."""
-        return True
+        return False
@@ -0,0 +1,121 @@
+import json
+import logging
+import re
+import threading
+import time
+from typing import IO, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# key=value pairs in request/response text that carry secrets
+SECRET_PATTERN = re.compile(r'(?i)((?:password|pwd|passwd|token)[^=&\n]*=)[^&\n]*')
+
+
+def redact(text: str) -> str:
+    """
+    Replace the values of password-like keys with REDACTED.
+
+    Args:
+        text: Endpoint or response text
+
+    Returns:
+        Redacted text
+    """
+    return SECRET_PATTERN.sub(r'\1REDACTED', text)
+
+
+class TrafficRecorder:
+    """
+    Record device request/response pairs to a JSON Lines fixture file.
+
+    Only the endpoint (never the host or the Authorization header) and the
+    redacted response body are stored, so fixtures can be shared. Binary
+    bodies such as images are recorded by size only.
+
+    record() only queues a line and runs on the event loop; the caller
+    writes the queue with write_pending() in the executor. The file is
+    opened and closed there too.
+    """
+
+    def __init__(self, fixture: IO[str]):
+        """
+        Initialize the recorder.
+
+        Args:
+            fixture: Open text file to append records to
+        """
+        self.fixture = fixture
+        self.records = 0
+        self._pending: List[str] = []
+        self._writing = False
+        self._lock = threading.Lock()
+        self._file_lock = threading.Lock()
+
+    @classmethod
+    def open(cls, path: str) -> "TrafficRecorder":
+        """Open a fixture file for appending; blocking, run it in the executor."""
+        return cls(open(path, "a", encoding="utf-8"))
+
+    def close(self) -> None:
+        """Write the queued lines and close the fixture file; blocking, run it in the executor."""
+        with self._lock:
+            lines, self._pending = self._pending, []
+        self._write_lines(lines)
+        with self._file_lock:
+            self.fixture.close()
+
+    def write_pending(self) -> None:
+        """Write the queued lines until the queue is empty; blocking, run it in the executor."""
+        while True:
+            with self._lock:
+                lines, self._pending = self._pending, []
+                if not lines:
+                    self._writing = False
+                    return
+            self._write_lines(lines)
+
+    def _write_lines(self, lines: List[str]) -> None:
+        """Write and flush lines, unless the file was closed meanwhile."""
+        with self._file_lock:
+            if lines and not self.fixture.closed:
+                self.fixture.write("".join(lines))
+                self.fixture.flush()
+
+    def record(
+        self,
+        endpoint: str,
+        body: Optional[Union[str, bytes]],
+        elapsed: float,
+        error: Optional[str] = None,
+    ) -> bool:
+        """
+        Queue one request/response pair.
+
+        Args:
+            endpoint: Requested endpoint, relative to the host
+            body: Response body, or None if the request failed
+            elapsed: Request duration in seconds
+            error: Error message if the request failed
+
+        Returns:
+            True if no write is in progress and write_pending() must be scheduled
+        """
+        entry = {
+            "time": time.time(),
+            "endpoint": redact(endpoint),
+            "elapsed": round(elapsed, 4),
+        }
+        if error is not None:
+            entry["error"] = redact(error)
+        elif isinstance(body, bytes):
+            entry["size"] = len(body)
+        else:
+            entry["body"] = redact(body or "")
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        self.records += 1
+        with self._lock:
+            self._pending.append(line)
+            if self._writing:
+                return False
+            self._writing = True
+            return True
@@ -1,13 +1,35 @@
+import asyncio
+from collections import deque
+from contextlib import nullcontext
+from email.utils import parsedate_to_datetime
 import logging
 import aiohttp
 from aiohttp import ClientTimeout, ClientSession
-from typing import Optional, Dict
+from typing import Any, AsyncIterator, Optional, Dict, Iterable, List, Mapping, Tuple
 import time
 import hashlib
 import re
-from urllib.parse import urlparse
+from urllib.parse import quote, urlparse
 
+from .const import (
+    CAPABILITY_RECORD_FINDER_COUNT,
+    CLIENT_KEEPALIVE_TIMEOUT,
+    CLOCK_SAMPLE_WINDOW,
+    CONF_EVENT_PAGE_SIZE,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_REQUEST_TIMEOUT,
+    CONF_VERIFY_SSL,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_REQUEST_TIMEOUT,
+    DEVICE_INFO_TTL,
+    DOOR_COMMAND_COALESCE_WINDOW,
+    EXPORT_PAGE_SIZE,
+    PROBE_TIMEOUT,
+)
+from .capture import TrafficRecorder
+from .device_info import IntelbrasDeviceInfo, parse_key_values
 from .event_parser import IntelbrasEventParser
+from .user_directory import parse_user_records
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,6 +41,19 @@ class DigestAuth:
         self.username = username
         self.password = password
         self.last_challenge = None
+        self.nonce_count = 0
+
+    def update_challenge(self, auth_header: str) -> Dict[str, str]:
+        """Store a fresh challenge so later requests can authenticate up front."""
+        self.last_challenge = self.parse_challenge(auth_header)
+        self.nonce_count = 0
+        return self.last_challenge
+
+    def authorization(self, method: str, uri: str) -> Optional[str]:
+        """Build an Authorization header from the cached challenge, if any."""
+        if not self.last_challenge:
+            return None
+        return self.create_digest_response(method, uri, self.last_challenge)
 
     def parse_challenge(self, auth_header: str) -> Dict[str, str]:
         """Parse the WWW-Authenticate header for digest challenge."""
@@ -45,7 +80,9 @@ class DigestAuth:
         
         # Client nonce for qop
         cnonce = hashlib.md5(f"{time.time()}".encode()).hexdigest()[:8]
-        nc = "00000001"  # Nonce count
+        # Nonce count, incremented so the cached nonce can be reused
+        self.nonce_count += 1
+        nc = f"{self.nonce_count:08x}"
         
         # Calculate HA1
         if algorithm.upper() == 'MD5':
@@ -88,6 +125,84 @@ class DigestAuth:
         return "Digest " + ", ".join(auth_parts)
 
 
+class DeviceClock:
+    """Estimate the device clock offset and round-trip time from HTTP Date headers.
+
+    A Date header only has one second resolution, but it was generated some
+    time between sending the request and receiving the response. Each sample
+    therefore bounds the offset (device time minus local time) to an interval,
+    and intersecting the intervals of recent samples narrows it down well below
+    one second.
+    """
+
+    def __init__(self, window: int = CLOCK_SAMPLE_WINDOW):
+        self._bounds = deque(maxlen=window)
+        self.rtt: Optional[float] = None
+        # None until the first response; False once a response came without
+        # a usable Date header and none has had one yet
+        self.sends_date: Optional[bool] = None
+
+    def add_sample(self, date_header: Optional[str], sent_at: float, received_at: float) -> None:
+        """Record a response Date header with the local send/receive times."""
+        rtt = received_at - sent_at
+        # Exponentially weighted RTT, like TCP's smoothed RTT
+        self.rtt = rtt if self.rtt is None else 0.875 * self.rtt + 0.125 * rtt
+        if not date_header:
+            self.sends_date = self.sends_date or False
+            return
+        try:
+            device_second = parsedate_to_datetime(date_header).timestamp()
+        except (TypeError, ValueError):
+            _LOGGER.debug("Ignoring unparsable Date header: %s", date_header)
+            self.sends_date = self.sends_date or False
+            return
+        self.sends_date = True
+        self._bounds.append((device_second - received_at, device_second + 1 - sent_at))
+
+    @property
+    def has_estimate(self) -> bool:
+        """Whether at least one Date header has been seen."""
+        return bool(self._bounds)
+
+    @property
+    def needs_sample(self) -> bool:
+        """Whether a clock sample is still worth requesting.
+
+        False once the device has answered without a Date header, since
+        firmware that omits it never yields an estimate.
+        """
+        return not self._bounds and self.sends_date is not False
+
+    def offset_bounds(self) -> Tuple[float, float]:
+        """Return the (low, high) bounds of the device clock offset in seconds."""
+        if not self._bounds:
+            return 0.0, 0.0
+        low = max(bound[0] for bound in self._bounds)
+        high = min(bound[1] for bound in self._bounds)
+        if low > high:
+            # The device clock was stepped; start over from the latest sample
+            latest = self._bounds[-1]
+            self._bounds.clear()
+            self._bounds.append(latest)
+            return latest
+        return low, high
+
+    @property
+    def offset(self) -> float:
+        """Best estimate of the device clock offset in seconds."""
+        low, high = self.offset_bounds()
+        return (low + high) / 2
+
+    def device_time(self) -> int:
+        """Return the latest device time (epoch seconds) that has surely passed.
+
+        Uses the lower offset bound, so records stamped up to this time
+        already exist on the device.
+        """
+        low, _ = self.offset_bounds()
+        return int(time.time() + low)
+
+
 class IntelbrasClient:
     """Async HTTP client for communicating with Intelbras 3542 MFW devices."""
 
@@ -98,73 +213,228 @@ class IntelbrasClient:
         self.password = password
         self.verify_ssl = verify_ssl
         self.digest_auth = DigestAuth(username, password)
+        self._session: Optional[ClientSession] = None
+        self._closed = False
+        self.clock = DeviceClock()
+        # Set to a TrafficRecorder to record requests for replay
+        self.capture: Optional[TrafficRecorder] = None
+        self.device_info: Optional[IntelbrasDeviceInfo] = None
+        self._device_info_fetched_at = 0.0
+        # In-flight/recent openDoor commands per channel: (started_at, task)
+        self._door_commands: Dict[int, Tuple[float, asyncio.Future]] = {}
+        # Tuning, adjustable at runtime with apply_settings
+        self.request_timeout = DEFAULT_REQUEST_TIMEOUT
+        self.page_size = EXPORT_PAGE_SIZE
+        self.max_concurrent_requests = DEFAULT_MAX_CONCURRENT_REQUESTS
+        self._request_slots = asyncio.Semaphore(self.max_concurrent_requests)
+
+    async def apply_settings(self, settings: Mapping[str, Any]) -> None:
+        """Apply tuning settings in place, keeping the session where possible.
+
+        Requests already waiting for a slot finish under the old concurrency
+        limit. Changing SSL verification replaces the shared session, so
+        only that setting costs a reconnect.
+        """
+        self.request_timeout = settings.get(CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT)
+        self.page_size = settings.get(CONF_EVENT_PAGE_SIZE, EXPORT_PAGE_SIZE)
+
+        max_concurrent = settings.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS)
+        if max_concurrent != self.max_concurrent_requests:
+            self.max_concurrent_requests = max_concurrent
+            self._request_slots = asyncio.Semaphore(max_concurrent)
+
+        verify_ssl = settings.get(CONF_VERIFY_SSL, False)
+        if verify_ssl != self.verify_ssl:
+            self.verify_ssl = verify_ssl
+            if self._session is not None:
+                session, self._session = self._session, None
+                await session.close()
+
+    def _get_session(self) -> ClientSession:
+        """Return the shared session, creating it on first use.
+
+        Keeping one session (and its keep-alive connections) around means a
+        door command does not pay for a new TCP connection on every press.
+        Once the client is closed no new session is opened, so a late task
+        can't leak one.
+        """
+        if self._closed:
+            raise RuntimeError("Client is closed")
+        if self._session is None or self._session.closed:
+            # Create SSL context
+            ssl_context = None if self.verify_ssl else False
+            connector = aiohttp.TCPConnector(
+                ssl=ssl_context,
+                keepalive_timeout=CLIENT_KEEPALIVE_TIMEOUT,
+            )
+            self._session = ClientSession(connector=connector)
+        return self._session
+
+    def supports(self, capability: str) -> bool:
+        """Return whether the device reports a capability; assumed until device info is known."""
+        return self.device_info is None or self.device_info.supports(capability)
+
+    async def start_capture(self, path: str) -> None:
+        """Start recording requests and responses to a fixture file."""
+        await self.stop_capture()
+        loop = asyncio.get_running_loop()
+        self.capture = await loop.run_in_executor(None, TrafficRecorder.open, path)
+        _LOGGER.info("Capturing device traffic to %s", path)
 
-    async def _make_request(self, endpoint: str, timeout: int = 20) -> str:
-        """Make an async HTTP request to the device with digest authentication."""
+    async def stop_capture(self) -> None:
+        """Stop recording and close the fixture file."""
+        if self.capture is None:
+            return
+        capture, self.capture = self.capture, None
+        await asyncio.get_running_loop().run_in_executor(None, capture.close)
+        _LOGGER.info("Captured %d requests", capture.records)
+
+    async def close(self) -> None:
+        """Close the shared session; the client can't be used afterwards."""
+        self._closed = True
+        await self.stop_capture()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _auth_headers(self, url: str) -> Dict[str, str]:
+        """Return digest headers for url using the cached challenge."""
+        parsed_url = urlparse(url)
+        uri = parsed_url.path
+        if parsed_url.query:
+            uri += f"?{parsed_url.query}"
+        auth_response = self.digest_auth.authorization("GET", uri)
+        return {"Authorization": auth_response} if auth_response else {}
+
+    async def _read_body(self, response, url: str, binary: bool):
+        """Read a response body as text, or as bytes when binary is set."""
+        if binary:
+            body = await response.read()
+            _LOGGER.debug("Response from %s: %d bytes", url, len(body))
+            return body
+        text = await response.text()
+        _LOGGER.debug("Response from %s: %s", url, text[:200])
+        return text
+
+    async def _make_request(
+        self,
+        endpoint: str,
+        timeout: Optional[int] = None,
+        binary: bool = False,
+        log_errors: bool = True,
+        use_slot: bool = True,
+    ):
+        """Make a request, recording it to the capture fixture when capturing.
+
+        At most max_concurrent_requests are sent to the device at once; the
+        timeout (request_timeout by default) starts once a slot is free.
+        Without use_slot the request skips the limit and is sent at once.
+        """
+        timeout = timeout or self.request_timeout
+        async with self._request_slots if use_slot else nullcontext():
+            if self.capture is None:
+                return await self._send_request(endpoint, timeout, binary, log_errors)
+
+            started = time.monotonic()
+            try:
+                body = await self._send_request(endpoint, timeout, binary, log_errors)
+            except Exception as e:
+                self._record_capture(endpoint, None, time.monotonic() - started, error=str(e))
+                raise
+            self._record_capture(endpoint, body, time.monotonic() - started)
+            return body
+
+    def _record_capture(self, endpoint: str, body, elapsed: float, error: Optional[str] = None) -> None:
+        """Queue a request for the capture fixture and write it in the executor."""
+        capture = self.capture
+        if capture is not None and capture.record(endpoint, body, elapsed, error=error):
+            asyncio.get_running_loop().run_in_executor(None, capture.write_pending)
+
+    async def _send_request(
+        self, endpoint: str, timeout: int, binary: bool, log_errors: bool
+    ):
+        """Make an async HTTP request to the device with digest authentication.
+
+        The digest challenge is cached, so once the first 401 has been seen
+        requests authenticate in a single round trip. A 401 on a cached
+        challenge (stale nonce) triggers one retry with the new challenge.
+        Returns the body as text, or as bytes when binary is set. Failures
+        are logged unless log_errors is False, for callers that expect them.
+        """
         url = f"{self.host}/{endpoint}"
         _LOGGER.debug("Making async request to %s", url)
-        
-        # Create SSL context
-        ssl_context = None if self.verify_ssl else False
-        
+
         # Set up timeout
         client_timeout = ClientTimeout(total=timeout)
-        
-        connector = aiohttp.TCPConnector(ssl=ssl_context)
-        
-        async with ClientSession(
-            timeout=client_timeout,
-            connector=connector
-        ) as session:
-            try:
-                # First attempt without auth to get the digest challenge
-                async with session.get(url) as response:
-                    if response.status == 401:
-                        # Get the WWW-Authenticate header
-                        auth_header = response.headers.get('WWW-Authenticate')
-                        if not auth_header or 'Digest' not in auth_header:
-                            raise aiohttp.ClientResponseError(
-                                request_info=response.request_info,
-                                history=response.history,
-                                status=401,
-                                message="Server requires Digest authentication but no digest challenge found"
-                            )
-                        
-                        # Parse the challenge
-                        challenge = self.digest_auth.parse_challenge(auth_header)
-                        _LOGGER.debug("Received digest challenge: %s", challenge)
-                        
-                        # Create the digest response
-                        parsed_url = urlparse(url)
-                        uri = parsed_url.path
-                        if parsed_url.query:
-                            uri += f"?{parsed_url.query}"
-                            
-                        auth_response = self.digest_auth.create_digest_response("GET", uri, challenge)
-                        
-                        # Make the authenticated request
-                        headers = {"Authorization": auth_response}
-                        async with session.get(url, headers=headers) as auth_resp:
-                            auth_resp.raise_for_status()
-                            text = await auth_resp.text()
-                            _LOGGER.debug("Authenticated response from %s: %s", url, text[:200])
-                            return text
-                    else:
-                        # Unexpected - got response without authentication
-                        response.raise_for_status()
-                        text = await response.text()
-                        _LOGGER.debug("Response from %s: %s", url, text[:200])
-                        return text
-                        
-            except aiohttp.ClientError as e:
+        session = self._get_session()
+
+        try:
+            sent_at = time.time()
+            async with session.get(
+                url, headers=self._auth_headers(url), timeout=client_timeout
+            ) as response:
+                self.clock.add_sample(response.headers.get('Date'), sent_at, time.time())
+                if response.status != 401:
+                    response.raise_for_status()
+                    return await self._read_body(response, url, binary)
+
+                # Get the WWW-Authenticate header
+                auth_header = response.headers.get('WWW-Authenticate')
+                if not auth_header or 'Digest' not in auth_header:
+                    raise aiohttp.ClientResponseError(
+                        request_info=response.request_info,
+                        history=response.history,
+                        status=401,
+                        message="Server requires Digest authentication but no digest challenge found"
+                    )
+
+                # Parse and cache the challenge
+                challenge = self.digest_auth.update_challenge(auth_header)
+                _LOGGER.debug("Received digest challenge: %s", challenge)
+                await response.read()
+
+            # Make the authenticated request
+            sent_at = time.time()
+            async with session.get(
+                url, headers=self._auth_headers(url), timeout=client_timeout
+            ) as auth_resp:
+                self.clock.add_sample(auth_resp.headers.get('Date'), sent_at, time.time())
+                auth_resp.raise_for_status()
+                return await self._read_body(auth_resp, url, binary)
+
+        except aiohttp.ClientError as e:
+            if log_errors:
                 _LOGGER.error("HTTP request failed for %s: %s", url, e)
-                raise
-            except Exception as e:
+            raise
+        except Exception as e:
+            if log_errors:
                 _LOGGER.error("Unexpected error making request to %s: %s", url, e)
-                raise
+            raise
 
     async def open_door(self, channel: int = 1) -> str:
-        """Open the door via the access control API."""
+        """Open the door via the access control API.
+
+        Concurrent presses for the same channel within
+        DOOR_COMMAND_COALESCE_WINDOW share a single openDoor command.
+        """
+        now = time.monotonic()
+        pending = self._door_commands.get(channel)
+        if pending and now - pending[0] < DOOR_COMMAND_COALESCE_WINDOW:
+            _LOGGER.debug("Coalescing openDoor request for channel %s", channel)
+            return await asyncio.shield(pending[1])
+
+        task = asyncio.ensure_future(self._open_door(channel))
+        self._door_commands[channel] = (now, task)
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            # Don't hand a failed command to callers still inside the window
+            if self._door_commands.get(channel, (None, None))[1] is task:
+                self._door_commands.pop(channel)
+            raise
+
+    async def _open_door(self, channel: int) -> str:
+        """Send the openDoor command."""
         endpoint = f"cgi-bin/accessControl.cgi?action=openDoor&channel={channel}"
         response_text = await self._make_request(endpoint)
         _LOGGER.info("Door open response: %s", response_text)
@@ -185,36 +455,266 @@ class IntelbrasClient:
         _LOGGER.debug("Door status response: %s", status)
         return status
     
-    async def get_events(self, start_time: int, end_time: int) -> str:
-        """Get events from the device."""
+    async def get_door_statuses(self, channels: Iterable[int]) -> Dict[int, str]:
+        """Get the status of several doors concurrently.
+
+        The device has no multi-channel status call, so the per-channel
+        requests are issued together over the shared session. Channels whose
+        query fails are reported as "unknown".
+        """
+        channels = list(channels)
+        results = await asyncio.gather(
+            *(self.get_door_status(channel) for channel in channels),
+            return_exceptions=True,
+        )
+        statuses = {}
+        for channel, result in zip(channels, results):
+            if isinstance(result, Exception):
+                _LOGGER.warning("Could not get status for door channel %s: %s", channel, result)
+                statuses[channel] = "unknown"
+            else:
+                statuses[channel] = result
+        return statuses
+
+    async def get_door_channels(self, fallback: Optional[List[int]] = None) -> List[int]:
+        """Discover the door channels configured on the device.
+
+        Reads the AccessControl config table, which has one entry per door.
+        Falls back to a single channel if the table can't be read.
+        """
+        try:
+            endpoint = "cgi-bin/configManager.cgi?action=getConfig&name=AccessControl"
+            response_text = await self._make_request(endpoint)
+        except Exception as e:
+            _LOGGER.warning("Could not discover door channels: %s", e)
+            return fallback or [1]
+
+        indexes = {
+            int(match) for match in re.findall(r'AccessControl\[(\d+)\]', response_text)
+        }
+        channels = sorted(index + 1 for index in indexes)
+        _LOGGER.debug("Discovered door channels: %s", channels)
+        return channels or fallback or [1]
+
+    async def probe(self, timeout: int = PROBE_TIMEOUT) -> float:
+        """Check the device is reachable with its cheapest endpoint.
+
+        Returns the round-trip time in seconds. Errors are raised but not
+        logged, since an offline device fails every probe. The probe doesn't
+        wait for a request slot, so its timeout and round-trip time measure
+        the device and not the queue of other requests.
+        """
+        started = time.monotonic()
+        await self._make_request(
+            "cgi-bin/global.cgi?action=getCurrentTime",
+            timeout=timeout,
+            log_errors=False,
+            use_slot=False,
+        )
+        return time.monotonic() - started
+
+    async def sync_clock(self) -> None:
+        """Take a clock sample from the device's lightweight time endpoint.
+
+        The body holds the local time without a time zone, so only the
+        response's Date header is used.
+        """
+        await self.probe(timeout=10)
+        _LOGGER.debug("Device clock offset %.3fs (bounds %s), RTT %.3fs",
+                      self.clock.offset, self.clock.offset_bounds(), self.clock.rtt)
+
+    async def get_events(
+        self,
+        start_time: int,
+        end_time: int,
+        count: Optional[int] = None,
+        conditions: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Get events from the device, at most count records when given.
+
+        conditions are passed as recordFinder condition.<Field>=<value>
+        filters so the device only returns matching records.
+        """
         endpoint = f"cgi-bin/recordFinder.cgi?action=find&name=AccessControlCardRec&StartTime={start_time}&EndTime={end_time}"
+        if count is not None:
+            endpoint += f"&count={count}"
+        for field_name, value in (conditions or {}).items():
+            endpoint += f"&condition.{field_name}={quote(str(value))}"
         response_text = await self._make_request(endpoint)
         _LOGGER.debug("Events response (first 500 chars): %s", response_text[:500])
         return response_text
 
-    async def get_device_info(self) -> Optional[dict]:
-        """Get device information."""
+    async def iter_event_pages(
+        self,
+        start_time: int,
+        end_time: int,
+        page_size: Optional[int] = None,
+        after_rec_no: Optional[int] = None,
+        conditions: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield the parsed records in a time range, one page at a time.
+
+        recordFinder has no offset parameter, so each page starts at the
+        CreateTime of the last record seen and records up to after_rec_no
+        are dropped. Only one page is held in memory at a time. page_size
+        defaults to the configured event page size; conditions are passed
+        on to recordFinder.
+        """
+        page_size = page_size or self.page_size
+        parser = IntelbrasEventParser(strict_mode=False)
+        if not self.supports(CAPABILITY_RECORD_FINDER_COUNT):
+            # Without count the device returns the whole range in one response
+            records = parser.parse(
+                await self.get_events(start_time, end_time, conditions=conditions)
+            )
+            if after_rec_no is not None:
+                records = [
+                    record for record in records
+                    if isinstance(record.get("RecNo"), int) and record["RecNo"] > after_rec_no
+                ]
+            if records:
+                yield records
+            return
+
+        while start_time <= end_time:
+            raw_events = await self.get_events(
+                start_time, end_time, count=page_size, conditions=conditions
+            )
+            records = parser.parse(raw_events)
+            new_records = [
+                record for record in records
+                if after_rec_no is None
+                or (isinstance(record.get("RecNo"), int) and record["RecNo"] > after_rec_no)
+            ]
+            if new_records:
+                yield new_records
+
+            if len(records) < page_size:
+                return
+
+            last_time = max(
+                (record["CreateTime"] for record in records if isinstance(record.get("CreateTime"), int)),
+                default=start_time,
+            )
+            if new_records:
+                after_rec_no = max(
+                    (record["RecNo"] for record in new_records if isinstance(record.get("RecNo"), int)),
+                    default=after_rec_no,
+                )
+                start_time = max(start_time, last_time)
+            else:
+                # A whole page within one second; the rest of it can't be reached
+                _LOGGER.warning("More than %d records at %s, skipping the rest of that second",
+                                page_size, start_time)
+                start_time = max(start_time, last_time) + 1
+
+    async def iter_users(self, page_size: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield the user records stored on the device, one page at a time.
+
+        Pages through an AccessUser find session, which is closed again once
+        the iteration ends. page_size defaults to the configured page size.
+        """
+        page_size = page_size or self.page_size
+        response_text = await self._make_request("cgi-bin/AccessUser.cgi?action=startFind")
+        token = parse_key_values(response_text).get("Token")
+        if token is None:
+            raise ValueError(f"No find token in AccessUser response: {response_text[:200]}")
+
+        try:
+            offset = 0
+            while True:
+                response_text = await self._make_request(
+                    f"cgi-bin/AccessUser.cgi?action=doFind&Token={token}&Offset={offset}&Count={page_size}"
+                )
+                users = parse_user_records(response_text)
+                if users:
+                    yield users
+                if len(users) < page_size:
+                    return
+                offset += len(users)
+        finally:
+            try:
+                await self._make_request(
+                    f"cgi-bin/AccessUser.cgi?action=stopFind&Token={token}", log_errors=False
+                )
+            except Exception as e:
+                _LOGGER.debug("Could not close AccessUser find session: %s", e)
+
+    async def get_users(self, user_ids: Iterable[Any]) -> List[Dict[str, Any]]:
+        """Get the user records of several UserIDs in a single request."""
+        query = "&".join(
+            f"UserIDList[{index}]={quote(str(user_id))}" for index, user_id in enumerate(user_ids)
+        )
+        response_text = await self._make_request(f"cgi-bin/AccessUser.cgi?action=list&{query}")
+        return parse_user_records(response_text)
+
+    async def get_device_info(self, force: bool = False) -> IntelbrasDeviceInfo:
+        """Get the parsed device information.
+
+        The result is cached for DEVICE_INFO_TTL; identity and capabilities
+        only change with a firmware upgrade, so this is fetched once at setup.
+        """
+        if (
+            not force
+            and self.device_info is not None
+            and time.monotonic() - self._device_info_fetched_at < DEVICE_INFO_TTL
+        ):
+            return self.device_info
+
         try:
             endpoint = "cgi-bin/magicBox.cgi?action=getDeviceInfo"
             response_text = await self._make_request(endpoint)
-            # Parse device info response here if needed
-            return {"raw_info": response_text}
         except Exception as e:
             _LOGGER.warning("Could not fetch device info: %s", e)
-            return None
+            raise
+
+        # Firmware version and capabilities are optional on older firmware
+        software_version, capabilities = await asyncio.gather(
+            self._make_request("cgi-bin/magicBox.cgi?action=getSoftwareVersion"),
+            self._make_request("cgi-bin/accessControlManager.cgi?action=getCaps"),
+            return_exceptions=True,
+        )
+        self.device_info = IntelbrasDeviceInfo.from_responses(
+            response_text,
+            software_version if isinstance(software_version, str) else None,
+            capabilities if isinstance(capabilities, str) else None,
+        )
+        self._device_info_fetched_at = time.monotonic()
+        _LOGGER.debug("Device info: %s", self.device_info)
+        return self.device_info
+
+    async def measure_latency(self, channel: int = 1) -> float:
+        """Return the round-trip time of an authenticated request, in seconds.
+
+        Uses the door status endpoint so the credentials are checked against
+        the access control CGI the integration relies on. Raises on
+        connection or authentication errors.
+        """
+        endpoint = f"cgi-bin/accessControl.cgi?action=getDoorStatus&channel={channel}"
+        started = time.monotonic()
+        await self._make_request(endpoint, timeout=10)
+        return time.monotonic() - started
 
     async def test_connection(self) -> bool:
         """Test if we can connect to the device."""
         try:
-            await self.get_device_info()
+            await self.measure_latency()
             return True
         except Exception as e:
             _LOGGER.error("Connection test failed: %s", e)
-            return False 
-    
+            return False
+
+
     async def download_file(self, file_name: str) -> str:
         """Download a file from the device."""
         endpoint = f"cgi-bin/FileManager.cgi?action=download&fileName={file_name}"
         response_text = await self._make_request(endpoint)
         _LOGGER.debug("Downloaded file: %s", response_text)
-        return response_text
\ No newline at end of file
+        return response_text
+
+    async def download_image(self, file_name: str) -> bytes:
+        """Download an image, such as an access record's face capture, from the device."""
+        endpoint = f"cgi-bin/FileManager.cgi?action=download&fileName={quote(file_name)}"
+        image = await self._make_request(endpoint, binary=True)
+        _LOGGER.debug("Downloaded image %s: %d bytes", file_name, len(image))
+        return image
\ No newline at end of file
@@ -1,17 +1,58 @@
+
 import logging
+import math
+from typing import Any, Mapping
+
+import aiohttp
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_USERNAME, CONF_PASSWORD
+from homeassistant.core import callback
+import homeassistant.helpers.config_validation as cv
 
+from .client import IntelbrasClient
+from .coordinator import get_entry_settings
+from .device_info import IntelbrasDeviceInfo
 from .const import (
-    DOMAIN, 
-    DEFAULT_HOST, 
-    CONF_HOST, 
-    CONF_USERNAME, 
-    CONF_PASSWORD, 
+    DOMAIN,
+    DEFAULT_HOST,
+    CONF_HOST,
+    CONF_USERNAME,
+    CONF_PASSWORD,
     CONF_VERIFY_SSL,
     CONF_EVENT_SCAN_INTERVAL,
-    DEFAULT_EVENT_SCAN_INTERVAL
+    CONF_ENABLE_CAMERA,
+    CONF_CAMERA_PROFILES,
+    CONF_RTSP_TRANSPORT,
+    CONF_STREAM_PREWARM,
+    CONF_STREAM_PREWARM_WINDOW,
+    CONF_EVENT_FIELDS,
+    CONF_FILTER_DOOR,
+    CONF_FILTER_TYPE,
+    CONF_FILTER_USER_ID,
+    CONF_REQUEST_TIMEOUT,
+    CONF_UPDATE_TIMEOUT,
+    CONF_EVENT_WINDOW_LAG,
+    CONF_EVENT_PAGE_SIZE,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_EVENT_SCAN_INTERVAL,
+    DEFAULT_CAMERA_PROFILES,
+    DEFAULT_RTSP_TRANSPORT,
+    DEFAULT_STREAM_PREWARM_WINDOW,
+    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_UPDATE_TIMEOUT,
+    DEFAULT_EVENT_WINDOW_LAG,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    EXPORT_PAGE_SIZE,
+    MIN_EVENT_SCAN_INTERVAL,
+    MAX_EVENT_SCAN_INTERVAL,
+    SCAN_INTERVAL_LATENCY_FACTOR,
+    STREAM_PROFILE_MAIN,
+    STREAM_PROFILE_SUB,
+    RTSP_TRANSPORTS,
+    OPTIONAL_EVENT_FIELDS,
+    EVENT_FIELDS_ALL,
+    EVENT_TYPES,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -22,7 +63,18 @@ _LOGGER.debug("Loading config_flow for %s", __name__)
 class IntelbrasConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Intelbras 3542 MF-W."""
 
-    VERSION = 1
+    VERSION = 2
+
+    def __init__(self):
+        """Initialize the config flow."""
+        self._data = {}
+        self._suggested_scan_interval = DEFAULT_EVENT_SCAN_INTERVAL
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Return the options flow for live tuning."""
+        return IntelbrasOptionsFlow()
 
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
@@ -30,24 +82,45 @@ class IntelbrasConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             try:
                 # Validate the device connection using the provided host, username, password, and SSL verification.
-                await self.hass.async_add_executor_job(
-                    fetch_data,
+                device_info, latency = await validate_connection(
                     user_input[CONF_HOST],
                     user_input[CONF_USERNAME],
                     user_input[CONF_PASSWORD],
                     user_input[CONF_VERIFY_SSL],
                 )
+            except aiohttp.ClientResponseError as err:
+                _LOGGER.error("Error connecting to device at %s: %s",
+                              user_input[CONF_HOST], err)
+                errors["base"] = "invalid_auth" if err.status == 401 else "cannot_connect"
             except Exception as err:
                 _LOGGER.error("Error connecting to device at %s: %s",
                               user_input[CONF_HOST], err)
                 errors["base"] = "cannot_connect"
             if not errors:
-                return self.async_create_entry(title="intelbras_3542_mfw", data=user_input)
+                if device_info.serial_number:
+                    await self.async_set_unique_id(device_info.serial_number)
+                    self._abort_if_unique_id_configured()
+                self._data = user_input
+                self._suggested_scan_interval = suggest_scan_interval(latency)
+                _LOGGER.debug("Measured %.3fs round trip, suggesting %ss scan interval",
+                              latency, self._suggested_scan_interval)
+                return await self.async_step_settings()
 
         return self.async_show_form(
             step_id="user", data_schema=self._get_data_schema(), errors=errors
         )
 
+    async def async_step_settings(self, user_input=None):
+        """Handle the polling settings step, pre-filled from the measured latency."""
+        if user_input is not None:
+            return self.async_create_entry(
+                title="intelbras_3542_mfw", data={**self._data, **_store_event_fields(user_input)}
+            )
+
+        return self.async_show_form(
+            step_id="settings", data_schema=self._get_settings_schema()
+        )
+
     def _get_data_schema(self):
         """Return the data schema for the user step."""
         return vol.Schema({
@@ -55,25 +128,111 @@ class IntelbrasConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             vol.Required(CONF_USERNAME): str,
             vol.Required(CONF_PASSWORD): str,
             vol.Optional(CONF_VERIFY_SSL, default=False): bool,
-            vol.Optional(CONF_EVENT_SCAN_INTERVAL, default=DEFAULT_EVENT_SCAN_INTERVAL): vol.All(vol.Coerce(int), vol.Range(min=5, max=300)),
         })
 
+    def _get_settings_schema(self):
+        """Return the data schema for the settings step."""
+        return vol.Schema(
+            _settings_fields({CONF_EVENT_SCAN_INTERVAL: self._suggested_scan_interval})
+        )
+
+
+class IntelbrasOptionsFlow(config_entries.OptionsFlow):
+    """Tune a configured terminal.
 
-def fetch_data(host, username, password, verify_ssl):
+    Changes are applied to the running client and coordinator by the
+    entry's update listener, without reloading the entry.
     """
-    A simple synchronous function to fetch data from the API using digest authentication.
-    It uses HTTP digest authentication by passing the username and password.
+
+    async def async_step_init(self, user_input=None):
+        """Handle the options step."""
+        if user_input is not None:
+            # Cleared filters must override the values set at creation
+            return self.async_create_entry(
+                data={
+                    CONF_FILTER_TYPE: None,
+                    CONF_FILTER_USER_ID: None,
+                    **_store_event_fields(user_input),
+                }
+            )
+
+        settings = get_entry_settings(self.config_entry)
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema({
+                **_settings_fields(settings),
+                vol.Optional(CONF_VERIFY_SSL, default=settings.get(CONF_VERIFY_SSL, False)): bool,
+                vol.Optional(CONF_REQUEST_TIMEOUT, default=settings.get(CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT)): vol.All(vol.Coerce(int), vol.Range(min=2, max=120)),
+                vol.Optional(CONF_UPDATE_TIMEOUT, default=settings.get(CONF_UPDATE_TIMEOUT, DEFAULT_UPDATE_TIMEOUT)): vol.All(vol.Coerce(int), vol.Range(min=2, max=120)),
+                vol.Optional(CONF_EVENT_WINDOW_LAG, default=settings.get(CONF_EVENT_WINDOW_LAG, DEFAULT_EVENT_WINDOW_LAG)): vol.All(vol.Coerce(int), vol.Range(min=0, max=60)),
+                vol.Optional(CONF_EVENT_PAGE_SIZE, default=settings.get(CONF_EVENT_PAGE_SIZE, EXPORT_PAGE_SIZE)): vol.All(vol.Coerce(int), vol.Range(min=10, max=1000)),
+                vol.Optional(CONF_MAX_CONCURRENT_REQUESTS, default=settings.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS)): vol.All(vol.Coerce(int), vol.Range(min=1, max=16)),
+            }),
+        )
+
+
+def _settings_fields(settings: Mapping[str, Any]) -> dict:
+    """Return the polling, camera and event query fields, defaulting to settings."""
+    return {
+        vol.Optional(CONF_EVENT_SCAN_INTERVAL, default=settings.get(CONF_EVENT_SCAN_INTERVAL, DEFAULT_EVENT_SCAN_INTERVAL)): vol.All(vol.Coerce(int), vol.Range(min=MIN_EVENT_SCAN_INTERVAL, max=MAX_EVENT_SCAN_INTERVAL)),
+        vol.Optional(CONF_ENABLE_CAMERA, default=settings.get(CONF_ENABLE_CAMERA, False)): bool,
+        vol.Optional(CONF_CAMERA_PROFILES, default=settings.get(CONF_CAMERA_PROFILES, DEFAULT_CAMERA_PROFILES)): cv.multi_select({
+            STREAM_PROFILE_MAIN: "Main stream (full resolution)",
+            STREAM_PROFILE_SUB: "Sub stream (low bitrate)",
+        }),
+        vol.Optional(CONF_RTSP_TRANSPORT, default=settings.get(CONF_RTSP_TRANSPORT, DEFAULT_RTSP_TRANSPORT)): vol.In(RTSP_TRANSPORTS),
+        vol.Optional(CONF_STREAM_PREWARM, default=settings.get(CONF_STREAM_PREWARM, False)): bool,
+        vol.Optional(CONF_STREAM_PREWARM_WINDOW, default=settings.get(CONF_STREAM_PREWARM_WINDOW, DEFAULT_STREAM_PREWARM_WINDOW)): vol.All(vol.Coerce(int), vol.Range(min=10, max=600)),
+        vol.Optional(CONF_EVENT_FIELDS, default=_event_fields_default(settings)): cv.multi_select({
+            EVENT_FIELDS_ALL: "All fields (no projection)",
+            **{field: field for field in OPTIONAL_EVENT_FIELDS},
+        }),
+        vol.Optional(CONF_FILTER_DOOR, default=settings.get(CONF_FILTER_DOOR, 0)): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional(CONF_FILTER_TYPE, description={"suggested_value": settings.get(CONF_FILTER_TYPE)}): vol.In(EVENT_TYPES),
+        vol.Optional(CONF_FILTER_USER_ID, description={"suggested_value": settings.get(CONF_FILTER_USER_ID)}): str,
+    }
+
+
+def _event_fields_default(settings: Mapping[str, Any]) -> list:
+    """Return the event fields to pre-select; all fields unless a projection is stored."""
+    fields = settings.get(CONF_EVENT_FIELDS)
+    return [EVENT_FIELDS_ALL] if fields is None else list(fields)
+
+
+def _store_event_fields(user_input: Mapping[str, Any]) -> dict:
+    """Return user_input with the event fields stored as None unless they were narrowed.
+
+    None means no projection, so every record field keeps reaching the
+    fired events; a list only projects when the user picked fields.
+    """
+    fields = user_input.get(CONF_EVENT_FIELDS)
+    if fields is None or EVENT_FIELDS_ALL in fields:
+        return {**user_input, CONF_EVENT_FIELDS: None}
+    return dict(user_input)
+
+
+async def validate_connection(host, username, password, verify_ssl) -> tuple[IntelbrasDeviceInfo, float]:
+    """
+    Validate the device using the integration's own async client.
+
+    Fetches the device info, checks the credentials against the access control
+    CGI and returns the device info together with the round-trip time of an
+    authenticated request in seconds.
+    """
+    client = IntelbrasClient(host, username, password, verify_ssl)
+    try:
+        device_info = await client.get_device_info()
+        # The challenge is cached by now, so this is a single round trip
+        return device_info, await client.measure_latency()
+    finally:
+        await client.close()
+
+
+def suggest_scan_interval(latency: float) -> int:
+    """Suggest an event scan interval from the measured round trip.
+
+    Fast devices keep the default; slow links get a proportionally longer
+    interval so polling never dominates the device's time.
     """
-    import requests
-    from requests.auth import HTTPDigestAuth
-
-    params = {}
-    response = requests.get(
-        host,
-        auth=HTTPDigestAuth(username, password),
-        params=params,
-        timeout=10,
-        verify=verify_ssl
-    )
-    response.raise_for_status()  # Raises an exception for HTTP errors
-    return response.text
+    interval = max(DEFAULT_EVENT_SCAN_INTERVAL, math.ceil(latency * SCAN_INTERVAL_LATENCY_FACTOR))
+    return min(interval, MAX_EVENT_SCAN_INTERVAL)
@@ -6,6 +6,118 @@ CONF_USERNAME = "username"
 CONF_PASSWORD = "password"
 CONF_VERIFY_SSL = "verify_ssl"
 CONF_EVENT_SCAN_INTERVAL = "event_scan_interval"
+CONF_ENABLE_CAMERA = "enable_camera"
+CONF_CAMERA_PROFILES = "camera_profiles"
+CONF_RTSP_TRANSPORT = "rtsp_transport"
+CONF_EVENT_FIELDS = "event_fields"
+CONF_FILTER_DOOR = "filter_door"
+CONF_FILTER_TYPE = "filter_type"
+CONF_FILTER_USER_ID = "filter_user_id"
+# Door channels discovered on the last run, so entities can load before the device answers
+CONF_DOOR_CHANNELS = "door_channels"
+# Performance tuning, adjustable at runtime from the options flow
+CONF_REQUEST_TIMEOUT = "request_timeout"
+CONF_UPDATE_TIMEOUT = "update_timeout"
+CONF_EVENT_PAGE_SIZE = "event_page_size"
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+CONF_EVENT_WINDOW_LAG = "event_window_lag"
+CONF_STREAM_PREWARM = "stream_prewarm"
+CONF_STREAM_PREWARM_WINDOW = "stream_prewarm_window"
 
 DEFAULT_HOST = "http://192.168.1.123"
-DEFAULT_EVENT_SCAN_INTERVAL = 30
\ No newline at end of file
+DEFAULT_EVENT_SCAN_INTERVAL = 30
+MIN_EVENT_SCAN_INTERVAL = 5
+MAX_EVENT_SCAN_INTERVAL = 300
+# Suggested scan interval is at least this many times the measured round trip
+SCAN_INTERVAL_LATENCY_FACTOR = 100
+
+DEFAULT_REQUEST_TIMEOUT = 20  # seconds per device request
+DEFAULT_UPDATE_TIMEOUT = 10  # seconds per event poll
+# Event query windows end this far behind the device clock, so records stored
+# after their CreateTime second (e.g. while the face capture is written) are
+# still picked up by the next window
+DEFAULT_EVENT_WINDOW_LAG = 2  # seconds
+# Requests in flight to one device; the embedded web server handles few at a time
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+
+# RTSP stream profiles and their realmonitor subtype
+STREAM_PROFILE_MAIN = "main"
+STREAM_PROFILE_SUB = "sub"
+STREAM_PROFILE_SUBTYPES = {
+    STREAM_PROFILE_MAIN: 0,
+    STREAM_PROFILE_SUB: 1,
+}
+DEFAULT_CAMERA_PROFILES = [STREAM_PROFILE_MAIN]
+RTSP_TRANSPORTS = ["tcp", "udp"]
+DEFAULT_RTSP_TRANSPORT = "tcp"
+# Camera streams kept running after Entry and denied access events
+DEFAULT_STREAM_PREWARM_WINDOW = 60  # seconds
+STREAM_PREWARM_MAX_STREAMS = 2  # warm streams across all terminals
+DATA_STREAM_WARMER = f"{DOMAIN}_stream_warmer"
+
+# Door command fast path
+DOOR_COMMAND_COALESCE_WINDOW = 2  # seconds
+DOOR_STATUS_RECHECK_DELAY = 3  # seconds
+CLIENT_KEEPALIVE_TIMEOUT = 75  # seconds
+
+# Device identity and capabilities only change with a firmware upgrade
+DEVICE_INFO_TTL = 24 * 60 * 60  # seconds
+# getCaps capabilities gating optional endpoints; unreported ones count as supported
+CAPABILITY_ACCESS_USER = "AccessUser"
+CAPABILITY_FILE_MANAGER = "FileManager"
+CAPABILITY_RECORD_FINDER_COUNT = "RecordFinderCount"
+
+# Number of recent Date header samples used for the device clock offset
+CLOCK_SAMPLE_WINDOW = 16
+
+# Event payloads larger than this (in characters) are parsed in the executor
+INLINE_PARSE_MAX_SIZE = 64 * 1024
+# Events fired between yields to the event loop
+EVENT_FIRE_BATCH_SIZE = 100
+
+# Access event media browser
+MEDIA_BROWSE_DAYS = 7  # days of device history listed per terminal
+MEDIA_BROWSE_MAX_EVENTS = 200  # newest events with an image listed per day
+MEDIA_CACHE_MAX_SIZE = 200 * 1024 * 1024  # bytes
+MEDIA_THUMBNAIL_SIZE = 320  # pixels
+
+# Access history export
+EXPORT_FORMAT_CSV = "csv"
+EXPORT_FORMAT_JSONL = "jsonl"
+EXPORT_PAGE_SIZE = 100  # records per recordFinder request
+
+# Record fields the integration itself relies on; always parsed
+REQUIRED_EVENT_FIELDS = [
+    "RecNo", "CreateTime", "Type", "Door", "Method", "ErrorCode", "UserID",
+]
+# Other AccessControlCardRec fields that can be selected for parsing
+OPTIONAL_EVENT_FIELDS = [
+    "CardNo", "CardName", "CardType", "UserType", "ReaderID", "Status",
+    "AttendanceState", "Mask", "RemainingTimes", "ReservedInt", "URL",
+]
+EVENT_FIELDS_ALL = "all"  # event fields choice that parses every field, without projection
+EVENT_TYPES = ["Entry", "Exit"]
+
+# User directory used to enrich access events
+USER_DIRECTORY_TTL = 24 * 60 * 60  # seconds before a cached user is fetched again
+USER_DIRECTORY_MISS_TTL = 60 * 60  # seconds before an unknown UserID is looked up again
+USER_DIRECTORY_BATCH_SIZE = 50  # UserIDs per AccessUser list request
+USER_TYPES = {
+    0: "general",
+    1: "blocklist",
+    2: "guest",
+    3: "patrol",
+    4: "vip",
+    5: "disabled",
+}
+
+# Bulk door commands across terminals
+DOOR_COMMAND_OPEN = "open"
+DOOR_COMMAND_STATUS = "status"
+BULK_DOOR_MAX_CONCURRENCY = 10  # doors commanded at once
+BULK_DOOR_TIMEOUT = 5  # seconds per door
+
+# Availability probe, separate from the event poll
+PROBE_INTERVAL = 5  # seconds
+PROBE_TIMEOUT = 3  # seconds
+PROBE_FAILURE_THRESHOLD = 2  # consecutive failures before the device is offline
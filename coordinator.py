@@ -1,7 +1,8 @@
+import asyncio
 from datetime import timedelta
 import logging
 import time
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Mapping, Optional
 
 import async_timeout
 
@@ -10,21 +11,61 @@ from homeassistant.helpers.update_coordinator import (
     UpdateFailed,
 )
 from homeassistant.helpers import device_registry as dr
-from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.core import HomeAssistant, callback
 
-from .const import DOMAIN, CONF_EVENT_SCAN_INTERVAL, DEFAULT_EVENT_SCAN_INTERVAL
-from .event_parser import IntelbrasEventParser
+from .const import (
+    DOMAIN,
+    CONF_HOST,
+    CONF_DOOR_CHANNELS,
+    CONF_EVENT_SCAN_INTERVAL,
+    CONF_EVENT_FIELDS,
+    CONF_FILTER_DOOR,
+    CONF_FILTER_TYPE,
+    CONF_FILTER_USER_ID,
+    CONF_UPDATE_TIMEOUT,
+    CONF_EVENT_WINDOW_LAG,
+    DEFAULT_EVENT_SCAN_INTERVAL,
+    DEFAULT_EVENT_WINDOW_LAG,
+    DEFAULT_UPDATE_TIMEOUT,
+    DOOR_STATUS_RECHECK_DELAY,
+    EVENT_FIRE_BATCH_SIZE,
+    INLINE_PARSE_MAX_SIZE,
+    PROBE_FAILURE_THRESHOLD,
+    PROBE_INTERVAL,
+    REQUIRED_EVENT_FIELDS,
+)
+from .access_statistics import IntelbrasAccessStatistics
+from .event_parser import IntelbrasEventParser, event_channel, event_matches
+from .user_directory import IntelbrasUserDirectory
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def get_entry_settings(config_entry) -> Dict[str, Any]:
+    """Return the settings of a config entry, options taking precedence over data."""
+    return {**config_entry.data, **config_entry.options}
+
+
+def get_device_link(host: str) -> DeviceInfo:
+    """Return the device info entities use to attach to the terminal's device.
+
+    Only the identifier is set: the coordinator registers the device with
+    its name, parsed model and versions, which entity device info would
+    otherwise overwrite.
+    """
+    return DeviceInfo(identifiers={(DOMAIN, host)})
+
+
 class IntelbrasEventsCoordinator(DataUpdateCoordinator):
     """Coordinator for Intelbras events."""
 
     def __init__(self, hass: HomeAssistant, config_entry, client):
         """Initialize the coordinator."""
         # Get scan interval from config entry or use default
-        scan_interval = config_entry.data.get(CONF_EVENT_SCAN_INTERVAL, DEFAULT_EVENT_SCAN_INTERVAL)
+        settings = get_entry_settings(config_entry)
+        scan_interval = settings.get(CONF_EVENT_SCAN_INTERVAL, DEFAULT_EVENT_SCAN_INTERVAL)
         
         super().__init__(
             hass,
@@ -41,10 +82,30 @@ class IntelbrasEventsCoordinator(DataUpdateCoordinator):
         )
         self.client = client
         self.config_entry = config_entry
-        self.event_parser = IntelbrasEventParser(strict_mode=False)
+        self.update_timeout = settings.get(CONF_UPDATE_TIMEOUT, DEFAULT_UPDATE_TIMEOUT)
+        self.window_lag = settings.get(CONF_EVENT_WINDOW_LAG, DEFAULT_EVENT_WINDOW_LAG)
+        self.apply_event_query_settings(settings)
         self.last_events: List[Dict[str, Any]] = []
-        self.last_door_status = None
+        self.statistics = IntelbrasAccessStatistics(
+            hass, config_entry.data.get(CONF_HOST, "unknown"), config_entry.title
+        )
+        # Names and groups of the device's users, for enriching fired events
+        self.users = IntelbrasUserDirectory()
+        self.last_door_status: Dict[int, str] = {}
+        self.channels: List[int] = config_entry.data.get(CONF_DOOR_CHANNELS, [1])
         self.device_id = None
+        self.last_updated = int(time.time()) - self.window_lag
+        self.first_refresh_duration: Optional[float] = None
+        # Longest time the event loop was blocked during the last update, in seconds
+        self.loop_block_time = 0.0
+        self._loop_section_started = 0.0
+        # Availability as seen by the lightweight probe
+        self.device_available = True
+        self.probe_rtt: Optional[float] = None
+        self.probe_failures = 0
+        self._probe_listeners: List[Callable[[], None]] = []
+        # Called with the payload of every fired access event
+        self._event_listeners: List[Callable[[Dict[str, Any]], None]] = []
 
     async def _async_setup(self):
         """Set up the coordinator
@@ -55,14 +116,168 @@ class IntelbrasEventsCoordinator(DataUpdateCoordinator):
         This method will be called automatically during
         coordinator.async_config_entry_first_refresh.
         """
-        # Initialize last updated timestamp
-        self.last_updated = int(time.time())
-        
+        # Fetch the device identity and capabilities once; the client caches them
+        try:
+            await self.client.get_device_info()
+        except Exception as err:
+            _LOGGER.warning("Continuing without device info: %s", err)
+
+        # Initialize last updated timestamp on the device's clock
+        self.last_updated = self.client.clock.device_time() - self.window_lag
+
         # Get or create device for event attribution
         await self._async_get_or_create_device()
+
+        # Discover the door channels driven by this controller
+        await self._async_discover_channels()
+
+        # A large user directory can take a while; events fired before it is
+        # loaded are enriched through batched lookups instead
+        self.config_entry.async_create_background_task(
+            self.hass, self._async_load_users(), f"{DOMAIN}_load_users_{self.config_entry.entry_id}"
+        )
         
         _LOGGER.debug("Events coordinator initialized with device_id: %s", self.device_id)
 
+    async def _async_load_users(self) -> None:
+        """Load the user directory from the device in bulk."""
+        try:
+            count = await self.users.async_load(self.client)
+        except Exception as err:
+            _LOGGER.warning("Could not load the user directory, looking users up per poll: %s", err)
+            return
+        if self.users.supported:
+            _LOGGER.debug("Loaded %d users from %s", count, self.config_entry.data.get(CONF_HOST))
+
+    @callback
+    def async_start_probe(self) -> Callable[[], None]:
+        """Start the periodic availability probe; returns the function that stops it."""
+        return async_track_time_interval(
+            self.hass, self._async_probe, timedelta(seconds=PROBE_INTERVAL)
+        )
+
+    @callback
+    def async_add_probe_listener(self, update_callback: Callable[[], None]) -> Callable[[], None]:
+        """Listen for probe results; returns the function that removes the listener."""
+        self._probe_listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._probe_listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_add_event_listener(
+        self, event_callback: Callable[[Dict[str, Any]], None]
+    ) -> Callable[[], None]:
+        """Listen for fired access events; returns the function that removes the listener."""
+        self._event_listeners.append(event_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._event_listeners.remove(event_callback)
+
+        return remove_listener
+
+    async def _async_probe(self, _now=None) -> None:
+        """Probe the device and track availability, RTT and consecutive failures."""
+        was_available = self.device_available
+        try:
+            self.probe_rtt = await self.client.probe()
+        except Exception as err:
+            self.probe_failures += 1
+            if was_available and self.probe_failures >= PROBE_FAILURE_THRESHOLD:
+                _LOGGER.warning("Device %s is offline: %s",
+                                self.config_entry.data.get(CONF_HOST), err)
+                self.device_available = False
+                self.async_update_listeners()
+        else:
+            self.probe_failures = 0
+            self.device_available = True
+            if not was_available:
+                _LOGGER.info("Device %s is back online", self.config_entry.data.get(CONF_HOST))
+                await self.async_request_refresh()
+
+        for update_callback in list(self._probe_listeners):
+            update_callback()
+
+    @callback
+    def apply_settings(self, settings: Mapping[str, Any]) -> None:
+        """Apply polling and event query settings in place.
+
+        The next poll picks up the new interval, timeout and filters; the
+        query window and the fired-event state carry over, so changing
+        them leaves no gap in event coverage.
+        """
+        update_interval = timedelta(
+            seconds=settings.get(CONF_EVENT_SCAN_INTERVAL, DEFAULT_EVENT_SCAN_INTERVAL)
+        )
+        if update_interval != self.update_interval:
+            self.update_interval = update_interval
+            # Reschedule now rather than after the old, possibly long, interval
+            if self._listeners:
+                self._schedule_refresh()
+        self.update_timeout = settings.get(CONF_UPDATE_TIMEOUT, DEFAULT_UPDATE_TIMEOUT)
+        self.window_lag = settings.get(CONF_EVENT_WINDOW_LAG, DEFAULT_EVENT_WINDOW_LAG)
+        self.apply_event_query_settings(settings)
+
+    def apply_event_query_settings(self, settings: Mapping[str, Any]) -> None:
+        """Set the device-side event filters and the parsed field projection."""
+        self.event_conditions: Dict[str, Any] = {}
+        if settings.get(CONF_FILTER_DOOR):
+            # Door is 0-based on the device
+            self.event_conditions["Door"] = settings[CONF_FILTER_DOOR] - 1
+        if settings.get(CONF_FILTER_TYPE):
+            self.event_conditions["Type"] = settings[CONF_FILTER_TYPE]
+        if settings.get(CONF_FILTER_USER_ID):
+            self.event_conditions["UserID"] = settings[CONF_FILTER_USER_ID]
+
+        fields = settings.get(CONF_EVENT_FIELDS)
+        self.event_parser = IntelbrasEventParser(
+            strict_mode=False,
+            fields=set(fields) | set(REQUIRED_EVENT_FIELDS) if fields is not None else None,
+        )
+
+    async def async_start(self, entities_loaded: bool = False) -> None:
+        """Run the coordinator setup and first refresh.
+
+        With entities_loaded, entities were already created from the channels
+        remembered from the last run, so this can run in the background
+        without holding up Home Assistant startup.
+        """
+        started = time.monotonic()
+        if entities_loaded:
+            await self._async_setup()
+            await self.async_refresh()
+        else:
+            await self.async_config_entry_first_refresh()
+        self.first_refresh_duration = time.monotonic() - started
+        _LOGGER.info("First refresh of %s took %.2fs",
+                     self.config_entry.data.get(CONF_HOST), self.first_refresh_duration)
+
+    async def _async_discover_channels(self):
+        """Discover the door channels and remember them for the next startup."""
+        known_channels = self.config_entry.data.get(CONF_DOOR_CHANNELS)
+        device_info = self.client.device_info
+        if device_info is not None and device_info.door_channels:
+            # The caps report the door count; no need to probe the config table
+            self.channels = list(range(1, device_info.door_channels + 1))
+        else:
+            self.channels = await self.client.get_door_channels(fallback=known_channels)
+        if self.channels == known_channels:
+            return
+
+        self.hass.config_entries.async_update_entry(
+            self.config_entry,
+            data={**self.config_entry.data, CONF_DOOR_CHANNELS: self.channels},
+        )
+        if known_channels is not None:
+            # Entities were created from the old channel list
+            _LOGGER.info("Door channels changed from %s to %s, reloading",
+                         known_channels, self.channels)
+            self.hass.config_entries.async_schedule_reload(self.config_entry.entry_id)
+
     async def _async_get_or_create_device(self):
         """Get or create the device entry for event attribution."""
         device_registry = dr.async_get(self.hass)
@@ -76,87 +291,205 @@ class IntelbrasEventsCoordinator(DataUpdateCoordinator):
             identifiers={device_identifier}
         )
         
+        device_info = self.client.device_info
+        device_attributes = {}
+        if device_info is not None:
+            device_attributes = {
+                "model": device_info.device_type or "3542 MFW",
+                "sw_version": device_info.firmware_version,
+                "hw_version": device_info.hardware_version,
+                "serial_number": device_info.serial_number,
+            }
+
         if device_entry:
             self.device_id = device_entry.id
             _LOGGER.debug("Found existing device: %s", self.device_id)
+            if device_attributes:
+                device_registry.async_update_device(self.device_id, **device_attributes)
         else:
             # Create new device entry
             device_entry = device_registry.async_get_or_create(
                 config_entry_id=self.config_entry.entry_id,
                 identifiers={device_identifier},
                 manufacturer="Intelbras",
-                model="3542 MFW",
                 name="Intelbras 3542 MFW",
                 configuration_url=host,
+                **{"model": "3542 MFW", **device_attributes},
             )
             self.device_id = device_entry.id
             _LOGGER.debug("Created new device: %s", self.device_id)
 
     async def _async_update_data(self):
         """Fetch data from API endpoint and fire events for new records."""
+        if not self.device_available:
+            # Skip the event query entirely; the probe triggers a refresh once
+            # the device answers again
+            raise UpdateFailed("Device is offline")
+
         try:
-            async with async_timeout.timeout(10):
-                # Get current timestamp
-                current_time = int(time.time())
-                
-                # Fetch raw events from the API (now async)
-                raw_events = await self.client.get_events(self.last_updated, current_time)
-                
-                # Parse the events using the event parser
-                parsed_events = []
-                if raw_events and isinstance(raw_events, str):
+            # Only the device I/O runs under the update timeout. Once the
+            # window is fetched it is committed before anything can yield, so
+            # a slow or cancelled update never fetches and fires it twice.
+            async with async_timeout.timeout(self.update_timeout):
+                # The device stamps records with its own clock, so the query
+                # window is built on it: from just after the previous window up
+                # to window_lag seconds before the latest device second that
+                # has surely passed. Windows don't overlap; the lag leaves
+                # records that are stored late time to appear before their
+                # second is queried.
+                if self.client.clock.needs_sample:
                     try:
-                        parsed_events = self.event_parser.parse(raw_events)
-                        _LOGGER.debug("Parsed %d events from raw data", len(parsed_events))
+                        await self.client.sync_clock()
                     except Exception as e:
-                        _LOGGER.warning("Failed to parse events: %s", e)
-                        parsed_events = []
-                elif isinstance(raw_events, list):
-                    parsed_events = raw_events
-
-                raw_door_status = await self.client.get_door_status()
-
-                if raw_door_status and isinstance(raw_door_status, str):
-                    self.last_door_status = raw_door_status
-                
-                # Fire events for new records
-                await self._async_fire_new_events(parsed_events)
-                
-                # Update state
-                self.last_events = parsed_events
-                self.last_updated = current_time
-                
-                return {
-                    "events": parsed_events,
-                    "last_updated": current_time,
-                    "total_events": len(parsed_events),
-                    "door_status": self.last_door_status
-                }
-                
+                        _LOGGER.debug("Could not sample device clock, using local time: %s", e)
+                current_time = self.client.clock.device_time() - self.window_lag
+                start_time = self.last_updated + 1
+
+                # Fetch raw events from the API (now async)
+                raw_events = ""
+                if current_time >= start_time:
+                    raw_events = await self.client.get_events(
+                        start_time, current_time, conditions=self.event_conditions
+                    )
+                else:
+                    current_time = self.last_updated
+
+                # Query every door channel in one concurrent batch
+                door_statuses = await self.client.get_door_statuses(self.channels)
+
+            # Everything from here to the next await runs on the event loop
+            self.loop_block_time = 0.0
+            self._start_loop_section()
+            self.last_door_status.update(door_statuses)
+
+            # Parse the events using the event parser
+            parsed_events = []
+            if raw_events and isinstance(raw_events, str):
+                try:
+                    parsed_events = await self._async_parse_events(raw_events)
+                    _LOGGER.debug("Parsed %d events from raw data", len(parsed_events))
+                except Exception as e:
+                    _LOGGER.warning("Failed to parse events: %s", e)
+                    parsed_events = []
+            elif isinstance(raw_events, list):
+                parsed_events = raw_events
+
+            # Firmware that ignores a condition still only yields matching events
+            if self.event_conditions:
+                parsed_events = [
+                    event for event in parsed_events
+                    if event_matches(event, self.event_conditions)
+                ]
+
+            # Update state before firing, which yields between batches
+            previous_events = self.last_events
+            self.last_events = parsed_events
+            self.last_updated = current_time
+
+            # Fire events for new records
+            await self._async_fire_new_events(parsed_events, previous_events)
+
+            self._end_loop_section()
+
+            # Import the hours the query window has moved past in the
+            # background, so a slow recorder never holds up the poll
+            self.config_entry.async_create_background_task(
+                self.hass,
+                self._async_flush_statistics(current_time),
+                f"{DOMAIN} statistics import",
+            )
+
+            return {
+                "events": parsed_events,
+                "last_updated": current_time,
+                "total_events": len(parsed_events),
+                "door_status": dict(self.last_door_status),
+                "loop_block_time": self.loop_block_time,
+            }
+
         except Exception as err:
             raise UpdateFailed(f"Error communicating with API: {err}")
 
-    async def _async_fire_new_events(self, current_events: List[Dict[str, Any]]):
+    async def _async_flush_statistics(self, until: int) -> None:
+        """Import the completed statistics hours, logging failures."""
+        try:
+            await self.statistics.async_flush(until)
+        except Exception as e:
+            _LOGGER.warning("Failed to import access statistics: %s", e)
+
+    def _start_loop_section(self) -> None:
+        """Mark the start of a stretch of update work that runs on the event loop."""
+        self._loop_section_started = time.perf_counter()
+
+    def _end_loop_section(self) -> None:
+        """Track the longest on-loop stretch between awaits in this update.
+
+        Called before every await that can yield, so parsing, filtering,
+        dedupe, firing and statistics are all covered, not only the parse.
+        """
+        self.loop_block_time = max(
+            self.loop_block_time, time.perf_counter() - self._loop_section_started
+        )
+
+    async def _async_parse_events(self, raw_events: str) -> List[Dict[str, Any]]:
+        """Parse raw events, off the event loop when the payload is large.
+
+        Small payloads are parsed inline, where a thread hop would cost more
+        than the parse. Large backfills go to the executor so they never stall
+        the event loop.
+        """
+        if len(raw_events) > INLINE_PARSE_MAX_SIZE:
+            _LOGGER.debug("Parsing %d chars of events in the executor", len(raw_events))
+            self._end_loop_section()
+            try:
+                return await self.hass.async_add_executor_job(self.event_parser.parse, raw_events)
+            finally:
+                self._start_loop_section()
+
+        return self.event_parser.parse(raw_events)
+
+    async def _async_fire_new_events(
+        self, current_events: List[Dict[str, Any]], previous_events: List[Dict[str, Any]]
+    ):
         """Fire Home Assistant events for new records that weren't in the last update."""
         if not current_events:
             return
             
         # Create a set of existing event signatures for comparison
         existing_signatures = set()
-        for event in self.last_events:
+        for event in previous_events:
             signature = self._create_event_signature(event)
             existing_signatures.add(signature)
         
-        # Check each current event and fire if it's new
-        new_events_count = 0
-        for event in current_events:
-            signature = self._create_event_signature(event)
-            if signature not in existing_signatures:
-                await self._async_fire_single_event(event)
-                new_events_count += 1
-        
-        if new_events_count > 0:
-            _LOGGER.info("Fired %d new events to Home Assistant", new_events_count)
+        new_events = [
+            event for event in current_events
+            if self._create_event_signature(event) not in existing_signatures
+        ]
+        if not new_events:
+            return
+
+        # Look up the users the directory doesn't know yet, all in one batch;
+        # events whose users can't be looked up in time fire unenriched
+        self._end_loop_section()
+        try:
+            async with async_timeout.timeout(self.update_timeout):
+                await self.users.async_resolve(
+                    self.client, (event.get("UserID") for event in new_events)
+                )
+        except asyncio.TimeoutError:
+            _LOGGER.debug("User lookup timed out, firing events without user details")
+        self._start_loop_section()
+
+        # Fire the new events, yielding to the event loop between batches so
+        # a backfill doesn't stall it
+        for index, event in enumerate(new_events, 1):
+            await self._async_fire_single_event(event)
+            if index % EVENT_FIRE_BATCH_SIZE == 0:
+                self._end_loop_section()
+                await asyncio.sleep(0)
+                self._start_loop_section()
+        self.statistics.add_events(new_events)
+        _LOGGER.info("Fired %d new events to Home Assistant", len(new_events))
 
     def _create_event_signature(self, event: Dict[str, Any]) -> str:
         """Create a unique signature for an event to detect duplicates."""
@@ -177,6 +510,8 @@ class IntelbrasEventsCoordinator(DataUpdateCoordinator):
         event_payload = {
             "device_id": self.device_id,
             "type": "intelbras_event",
+            "channel": event_channel(event_data),
+            **self.users.enrich(event_data),
             **event_data  # Include all event data
         }
         
@@ -188,17 +523,50 @@ class IntelbrasEventsCoordinator(DataUpdateCoordinator):
             f"{DOMAIN}_event",  # Event type: intelbras_3542mfw_event
             event_payload
         )
+        for event_callback in list(self._event_listeners):
+            event_callback(event_payload)
+
+    @callback
+    def async_set_door_status(self, status: str, channel: int = 1) -> None:
+        """Push a door status to listeners without polling the device.
 
-    def get_door_status(self) -> str:
-        """Get the door status from the coordinator data."""
+        Used for the optimistic "open" state right after an openDoor command.
+        """
+        self.last_door_status[channel] = status
+        if isinstance(self.data, dict):
+            self.data = {**self.data, "door_status": dict(self.last_door_status)}
+        self.async_update_listeners()
+
+    async def async_recheck_door_status(
+        self, channel: int = 1, delay: float = DOOR_STATUS_RECHECK_DELAY
+    ) -> None:
+        """Re-read only the door status after delay, instead of a full refresh."""
+        await asyncio.sleep(delay)
+        try:
+            raw_door_status = await self.client.get_door_status(channel)
+        except Exception as err:
+            _LOGGER.debug("Door status re-check failed: %s", err)
+            return
+        if raw_door_status and isinstance(raw_door_status, str):
+            self.async_set_door_status(raw_door_status, channel)
+
+    def get_door_status(self, channel: int = 1) -> str:
+        """Get the door status of a channel from the coordinator data."""
         if self.data and isinstance(self.data, dict):
-            return self.data.get("door_status", "unknown")
+            return self.data.get("door_status", {}).get(channel, "unknown")
         return "unknown"
 
-    def get_latest_events(self) -> List[Dict[str, Any]]:
-        """Get the latest events from the coordinator data."""
+    def get_latest_events(self, channel: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get the latest events from the coordinator data.
+
+        If channel is given, only events whose Door field (0-based on the
+        device) matches that channel are returned.
+        """
         if self.data and isinstance(self.data, dict):
-            return self.data.get("events", [])
+            events = self.data.get("events", [])
+            if channel is None:
+                return events
+            return [event for event in events if event_channel(event) == channel]
         return []
 
     def get_event_count(self) -> int:
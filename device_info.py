@@ -0,0 +1,101 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def parse_key_values(raw_data: str) -> Dict[str, str]:
+    """
+    Parse a magicBox/caps style "key=value" response into a dictionary.
+
+    Prefixes such as "caps." or "table." are dropped from the keys.
+
+    Args:
+        raw_data: Raw response text
+
+    Returns:
+        Dictionary of keys to string values
+    """
+    values = {}
+    if not isinstance(raw_data, str):
+        return values
+
+    for line in raw_data.splitlines():
+        line = line.strip()
+        if not line or '=' not in line:
+            continue
+        key, value = line.split('=', 1)
+        key = key.strip()
+        for prefix in ("caps.", "table."):
+            if key.startswith(prefix):
+                key = key[len(prefix):]
+        values[key] = value.strip()
+    return values
+
+
+@dataclass
+class IntelbrasDeviceInfo:
+    """Parsed identity and capabilities of an Intelbras 3542 MFW device."""
+
+    device_type: Optional[str] = None
+    serial_number: Optional[str] = None
+    firmware_version: Optional[str] = None
+    hardware_version: Optional[str] = None
+    capabilities: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_responses(
+        cls,
+        device_info: str,
+        software_version: Optional[str] = None,
+        capabilities: Optional[str] = None,
+    ) -> "IntelbrasDeviceInfo":
+        """
+        Build the device info from the raw magicBox and caps responses.
+
+        Args:
+            device_info: Response of magicBox getDeviceInfo
+            software_version: Response of magicBox getSoftwareVersion, if available
+            capabilities: Response of accessControlManager getCaps, if available
+
+        Returns:
+            Parsed device info
+        """
+        info = parse_key_values(device_info)
+        firmware = parse_key_values(software_version or "").get("version")
+        if firmware is None:
+            firmware = info.get("softwareVersion")
+        if firmware:
+            # e.g. "2.800.0000000.8.R,build:2020-12-08"
+            firmware = firmware.split(',', 1)[0]
+
+        return cls(
+            device_type=info.get("deviceType") or info.get("DeviceType"),
+            serial_number=info.get("serialNumber") or info.get("SerialNo"),
+            firmware_version=firmware or None,
+            hardware_version=info.get("hardwareVersion") or info.get("HardwareVersion"),
+            capabilities=parse_key_values(capabilities or ""),
+        )
+
+    @property
+    def door_channels(self) -> Optional[int]:
+        """Number of doors reported by the capabilities, if known."""
+        value = self.capabilities.get("AccessControlChannels")
+        try:
+            return int(value) if value is not None else None
+        except ValueError:
+            logger.warning(f"Invalid AccessControlChannels capability: {value}")
+            return None
+
+    def supports(self, capability: str, default: bool = True) -> bool:
+        """
+        Return whether a boolean capability is enabled.
+
+        Capabilities the firmware doesn't report fall back to default, so
+        older firmware keeps the behavior it had before capabilities were read.
+        """
+        value = self.capabilities.get(capability)
+        if value is None:
+            return default
+        return value.lower() in ("true", "1", "yes")
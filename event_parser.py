@@ -1,11 +1,32 @@
 import logging
 import re
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, Iterable, List, Any
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 
+NUMERIC_FIELDS = frozenset({
+    'AttendanceState', 'CardType', 'CreateTime', 'Door', 'ErrorCode',
+    'Mask', 'Method', 'ReaderID', 'RecNo', 'RemainingTimes',
+    'ReservedInt', 'Status', 'UserType'
+})
+
+
+def event_channel(event: Dict[str, Any]) -> int:
+    """Return the door channel of an event from its 0-based Door field."""
+    door = event.get("Door", 0)
+    return door + 1 if isinstance(door, int) else 1
+
+
+def event_matches(event: Dict[str, Any], conditions: Dict[str, Any]) -> bool:
+    """Check an event against recordFinder conditions, for firmware that ignores them."""
+    return all(
+        str(event.get(field_name)) == str(value)
+        for field_name, value in conditions.items()
+    )
+
+
 class IntelbrasEventParserError(Exception):
     """Custom exception for parser errors."""
     pass
@@ -14,17 +35,21 @@ class IntelbrasEventParserError(Exception):
 class IntelbrasEventParser:
     """Safe parser for Intelbras 3542 MFW event data."""
     
-    def __init__(self, strict_mode: bool = False):
+    def __init__(self, strict_mode: bool = False, fields: Optional[Iterable[str]] = None):
         """
         Initialize the parser.
         
         Args:
             strict_mode: If True, raise exceptions on parse errors. 
                         If False, log errors and continue parsing.
+            fields: If given, only these record fields are parsed; lines for
+                    other fields are skipped before any matching or conversion.
         """
         self.strict_mode = strict_mode
+        self.fields = frozenset(fields) if fields is not None else None
         self.record_pattern = re.compile(r'^records\[(\d+)\]\.([^=]+)=(.*)$')
         self.found_pattern = re.compile(r'^found=(\d+)$')
+        self._debug = False
 
     def parse(self, raw_data: str) -> List[Dict[str, Any]]:
         """
@@ -52,6 +77,8 @@ class IntelbrasEventParser:
 
         events = []
         records = {}  # Store records by index
+        # Per-line debug messages are only formatted when they will be emitted
+        self._debug = logger.isEnabledFor(logging.DEBUG)
         
         for line_num, line in enumerate(raw_data.splitlines(), 1):
             line = line.strip()
@@ -61,12 +88,15 @@ class IntelbrasEventParser:
                 
             try:
                 if line.startswith("records["):
+                    if self.fields is not None and not self._is_projected(line):
+                        continue
                     self._parse_record_line(line, records, line_num)
                 elif line.startswith("found="):
                     # Optional: store found count for validation
                     found_count = self._parse_found_line(line, line_num)
-                    logger.debug(f"Found count: {found_count}")
-                else:
+                    if self._debug:
+                        logger.debug(f"Found count: {found_count}")
+                elif self._debug:
                     logger.debug(f"Skipping unrecognized line {line_num}: {line}")
                     
             except Exception as e:
@@ -90,6 +120,12 @@ class IntelbrasEventParser:
         logger.info(f"Successfully parsed {len(events)} events")
         return events
     
+    def _is_projected(self, line: str) -> bool:
+        """Check whether a record line's field was requested, without a regex match."""
+        dot = line.find('.')
+        equals = line.find('=', dot)
+        return dot != -1 and equals != -1 and line[dot + 1:equals] in self.fields
+
     def _parse_found_line(self, line: str, line_num: int) -> int:
         """
         Parse the found line and return the number of events.
@@ -148,7 +184,8 @@ class IntelbrasEventParser:
         converted_value = self._convert_value(field_value, field_name, line_num)
         records[record_index][field_name] = converted_value
         
-        logger.debug(f"Parsed: records[{record_index}].{field_name} = {converted_value}")
+        if self._debug:
+            logger.debug(f"Parsed: records[{record_index}].{field_name} = {converted_value}")
     
     def _convert_value(self, value: str, field_name: str, line_num: int) -> Any:
         """
@@ -166,13 +203,7 @@ class IntelbrasEventParser:
             return ""
         
         # Try to convert numeric fields
-        numeric_fields = {
-            'AttendanceState', 'CardType', 'CreateTime', 'Door', 'ErrorCode',
-            'Mask', 'Method', 'ReaderID', 'RecNo', 'RemainingTimes', 
-            'ReservedInt', 'Status', 'UserType'
-        }
-        
-        if field_name in numeric_fields:
+        if field_name in NUMERIC_FIELDS:
             try:
                 return int(value)
             except ValueError:
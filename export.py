@@ -0,0 +1,115 @@
+import csv
+import json
+import logging
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+from homeassistant.core import HomeAssistant
+
+from .const import EXPORT_FORMAT_CSV
+
+_LOGGER = logging.getLogger(__name__)
+
+# Columns of the CSV export; JSON Lines keeps every field of a record
+EXPORT_FIELDS = [
+    "RecNo", "CreateTime", "Type", "Door", "Method", "ErrorCode", "Status",
+    "UserID", "CardNo", "CardName", "CardType", "UserType", "ReaderID",
+    "AttendanceState", "Mask", "RemainingTimes", "URL",
+]
+
+
+class IntelbrasEventExporter:
+    """Stream the device's access record history to a CSV or JSON Lines file.
+
+    Records are written page by page as they arrive, so memory use doesn't
+    grow with the length of the range. After every page the last exported
+    RecNo is saved next to the file, so an interrupted export can resume.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client,
+        path: str,
+        export_format: str = EXPORT_FORMAT_CSV,
+        page_size: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, Optional[int]], None]] = None,
+    ):
+        """Initialize the exporter; page_size defaults to the client's."""
+        self.hass = hass
+        self.client = client
+        self.path = path
+        self.state_path = f"{path}.state"
+        self.export_format = export_format
+        self.page_size = page_size
+        self.progress_callback = progress_callback
+        self.exported = 0
+
+    async def async_export(self, start_time: int, end_time: int, resume: bool = False) -> int:
+        """Export the records between start_time and end_time; returns the total exported."""
+        after_rec_no = None
+        state = await self.hass.async_add_executor_job(self._read_state) if resume else None
+        if state:
+            start_time = max(start_time, state.get("create_time") or start_time)
+            after_rec_no = state["rec_no"]
+            self.exported = state["count"]
+            _LOGGER.info("Resuming export to %s after RecNo %s", self.path, after_rec_no)
+        else:
+            await self.hass.async_add_executor_job(self._start_file)
+
+        # Write each page in the executor while the next one is fetched
+        pending_write = None
+        async for records in self.client.iter_event_pages(
+            start_time, end_time, self.page_size, after_rec_no
+        ):
+            if pending_write is not None:
+                await pending_write
+            pending_write = self.hass.async_add_executor_job(self._write_page, records)
+        if pending_write is not None:
+            await pending_write
+
+        _LOGGER.info("Exported %d records to %s", self.exported, self.path)
+        return self.exported
+
+    def _read_state(self) -> Optional[Dict[str, Any]]:
+        """Read the resume state of a previous export, if any."""
+        try:
+            with open(self.state_path, encoding="utf-8") as state_file:
+                return json.load(state_file)
+        except (OSError, ValueError):
+            return None
+
+    def _start_file(self) -> None:
+        """Truncate the export file and write the CSV header."""
+        with open(self.path, "w", encoding="utf-8", newline="") as export_file:
+            if self.export_format == EXPORT_FORMAT_CSV:
+                csv.DictWriter(export_file, EXPORT_FIELDS).writeheader()
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
+
+    def _write_page(self, records: List[Dict[str, Any]]) -> None:
+        """Append a page of records and save the resume state."""
+        with open(self.path, "a", encoding="utf-8", newline="") as export_file:
+            if self.export_format == EXPORT_FORMAT_CSV:
+                writer = csv.DictWriter(export_file, EXPORT_FIELDS, extrasaction="ignore")
+                writer.writerows(records)
+            else:
+                for record in records:
+                    export_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        self.exported += len(records)
+        last = max(records, key=lambda record: record.get("RecNo", -1))
+        state = {
+            "rec_no": last.get("RecNo"),
+            "create_time": last.get("CreateTime"),
+            "count": self.exported,
+        }
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as state_file:
+            json.dump(state, state_file)
+        os.replace(tmp_path, self.state_path)
+
+        if self.progress_callback is not None:
+            self.hass.loop.call_soon_threadsafe(
+                self.progress_callback, self.exported, last.get("CreateTime")
+            )
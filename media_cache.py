@@ -0,0 +1,151 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.json"
+
+
+class IntelbrasMediaCache:
+    """
+    Size-bounded, content-addressed LRU cache of images on disk.
+
+    Blobs are stored by the SHA-256 of their content, so identical images are
+    only kept once. A small JSON index maps cache keys (device file path plus
+    variant) to blob digests. The blobs are kept in memory in LRU order with
+    their sizes and a running total, so evicting never walks the directory;
+    the directory is scanned once, on first use, and blob modification times
+    carry the recency order across restarts.
+
+    All methods do blocking file I/O and must run in the executor.
+    """
+
+    def __init__(self, path: str, max_size: int):
+        """
+        Initialize the cache.
+
+        Args:
+            path: Directory holding the blobs and the index
+            max_size: Maximum total size of the blobs in bytes
+        """
+        self.path = path
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, str]] = None
+        # digest -> size, least recently used first
+        self._blobs: Optional["OrderedDict[str, int]"] = None
+        self._total_size = 0
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.path, digest[:2], digest)
+
+    def _load_index(self) -> Dict[str, str]:
+        if self._index is None:
+            try:
+                with open(os.path.join(self.path, INDEX_FILE), encoding="utf-8") as index_file:
+                    self._index = json.load(index_file)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _load_blobs(self) -> "OrderedDict[str, int]":
+        """Scan the blobs once, ordered by modification time."""
+        if self._blobs is None:
+            blobs = []
+            for root, _dirs, files in os.walk(self.path):
+                if root == self.path:
+                    continue
+                for name in files:
+                    try:
+                        stat = os.stat(os.path.join(root, name))
+                    except OSError:
+                        continue
+                    blobs.append((stat.st_mtime, name, stat.st_size))
+            self._blobs = OrderedDict((name, size) for _mtime, name, size in sorted(blobs))
+            self._total_size = sum(self._blobs.values())
+        return self._blobs
+
+    def _save_index(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        tmp_path = os.path.join(self.path, f"{INDEX_FILE}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as index_file:
+            json.dump(self._index, index_file)
+        os.replace(tmp_path, os.path.join(self.path, INDEX_FILE))
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Return the cached content for key, marking it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached bytes, or None on a miss
+        """
+        with self._lock:
+            digest = self._load_index().get(key)
+            if digest is None:
+                return None
+            blobs = self._load_blobs()
+            blob_path = self._blob_path(digest)
+            try:
+                with open(blob_path, "rb") as blob:
+                    data = blob.read()
+                os.utime(blob_path)
+            except OSError:
+                # Blob was evicted or removed; forget the key
+                self._index.pop(key, None)
+                self._total_size -= blobs.pop(digest, 0)
+                self._save_index()
+                return None
+            if digest in blobs:
+                blobs.move_to_end(digest)
+            return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """
+        Store content under key and evict least recently used blobs if needed.
+
+        Args:
+            key: Cache key
+            data: Content to store
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            blobs = self._load_blobs()
+            blob_path = self._blob_path(digest)
+            if digest in blobs:
+                os.utime(blob_path)
+                blobs.move_to_end(digest)
+            else:
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                with open(blob_path, "wb") as blob:
+                    blob.write(data)
+                blobs[digest] = len(data)
+                self._total_size += len(data)
+            self._load_index()[key] = digest
+            self._evict()
+            self._save_index()
+
+    def _evict(self) -> None:
+        """Remove least recently used blobs until the cache fits max_size."""
+        evicted = set()
+        while self._total_size > self.max_size and len(self._blobs) > 1:
+            digest, size = self._blobs.popitem(last=False)
+            try:
+                os.remove(self._blob_path(digest))
+            except OSError:
+                pass
+            self._total_size -= size
+            evicted.add(digest)
+
+        if evicted:
+            self._index = {
+                key: digest for key, digest in self._index.items() if digest not in evicted
+            }
+            logger.debug(f"Evicted {len(evicted)} blobs from media cache")
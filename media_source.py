@@ -0,0 +1,292 @@
+import io
+import logging
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Optional
+from urllib.parse import quote
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.components.media_player import MediaClass
+from homeassistant.components.media_source import (
+    BrowseMediaSource,
+    MediaSource,
+    MediaSourceItem,
+    PlayMedia,
+    Unresolvable,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CAPABILITY_FILE_MANAGER,
+    CONF_HOST,
+    DOMAIN,
+    MEDIA_BROWSE_DAYS,
+    MEDIA_BROWSE_MAX_EVENTS,
+    MEDIA_CACHE_MAX_SIZE,
+    MEDIA_THUMBNAIL_SIZE,
+)
+from .media_cache import IntelbrasMediaCache
+
+_LOGGER = logging.getLogger(__name__)
+
+IMAGE_URL = f"/api/{DOMAIN}/event_image/{{entry_id}}/{{file_path}}"
+DAY_FORMAT = "%Y-%m-%d"
+
+
+async def async_get_media_source(hass: HomeAssistant) -> MediaSource:
+    """Set up the Intelbras media source."""
+    cache = IntelbrasMediaCache(hass.config.path(".cache", DOMAIN), MEDIA_CACHE_MAX_SIZE)
+    hass.http.register_view(IntelbrasEventImageView(hass, cache))
+    return IntelbrasMediaSource(hass)
+
+
+def _get_coordinator(hass: HomeAssistant, entry_id: str):
+    """Return the coordinator of a loaded config entry, if any."""
+    entry_data = hass.data.get(DOMAIN, {}).get(entry_id)
+    return entry_data["coordinator"] if entry_data else None
+
+
+def _is_event_image(file_path: str) -> bool:
+    """Check a device file path looks like an event image, so the view can't fetch other files."""
+    return (
+        file_path.startswith("/")
+        and ".." not in file_path.split("/")
+        and file_path.lower().endswith((".jpg", ".jpeg"))
+    )
+
+
+def _image_url(entry_id: str, file_path: str) -> str:
+    """Return the view URL of a device image file."""
+    return IMAGE_URL.format(entry_id=entry_id, file_path=quote(file_path.lstrip("/")))
+
+
+def _event_title(event: dict) -> str:
+    """Return a human readable title for an access event."""
+    create_time = event.get("CreateTime")
+    when = (
+        datetime.fromtimestamp(create_time).strftime("%Y-%m-%d %H:%M:%S")
+        if isinstance(create_time, int) else str(create_time)
+    )
+    who = event.get("UserID") or event.get("CardNo") or "unknown"
+    result = "denied" if event.get("ErrorCode") else event.get("Type", "event")
+    return f"{when} - {result} - {who}"
+
+
+class IntelbrasMediaSource(MediaSource):
+    """Browse the access history of each terminal and its face captures.
+
+    Events are listed per day straight from the device history, so they
+    survive restarts. Images are identified by their device file path,
+    which is also their cache key.
+    """
+
+    name = "Intelbras 3542 MFW"
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the media source."""
+        super().__init__(DOMAIN)
+        self.hass = hass
+
+    async def async_resolve_media(self, item: MediaSourceItem) -> PlayMedia:
+        """Resolve an event image to the URL of the image view."""
+        try:
+            entry_id, kind, file_path = item.identifier.split("/", 2)
+        except (AttributeError, ValueError) as err:
+            raise Unresolvable(f"Unknown media item: {item.identifier}") from err
+        file_path = f"/{file_path}"
+        if kind != "image" or not _is_event_image(file_path):
+            raise Unresolvable(f"Unknown media item: {item.identifier}")
+        return PlayMedia(_image_url(entry_id, file_path), "image/jpeg")
+
+    async def async_browse_media(self, item: MediaSourceItem) -> BrowseMediaSource:
+        """List terminals, the days of a terminal, or the events of a day."""
+        if not item.identifier:
+            return self._browse_root()
+
+        entry_id, _, day = item.identifier.partition("/")
+        coordinator = _get_coordinator(self.hass, entry_id)
+        if coordinator is None:
+            raise Unresolvable(f"Unknown terminal: {entry_id}")
+        if not day:
+            return self._browse_terminal(entry_id, coordinator)
+        try:
+            day_start = dt_util.start_of_local_day(datetime.strptime(day, DAY_FORMAT).date())
+        except ValueError as err:
+            raise Unresolvable(f"Unknown day: {day}") from err
+        return await self._async_browse_day(entry_id, coordinator, day, day_start)
+
+    def _browse_root(self) -> BrowseMediaSource:
+        """List the configured terminals."""
+        children = []
+        for entry in self.hass.config_entries.async_entries(DOMAIN):
+            if _get_coordinator(self.hass, entry.entry_id) is None:
+                continue
+            children.append(BrowseMediaSource(
+                domain=DOMAIN,
+                identifier=entry.entry_id,
+                media_class=MediaClass.DIRECTORY,
+                media_content_type="",
+                title=entry.title,
+                can_play=False,
+                can_expand=True,
+            ))
+
+        return BrowseMediaSource(
+            domain=DOMAIN,
+            identifier=None,
+            media_class=MediaClass.DIRECTORY,
+            media_content_type="",
+            title=self.name,
+            can_play=False,
+            can_expand=True,
+            children=children,
+            children_media_class=MediaClass.DIRECTORY,
+        )
+
+    def _browse_terminal(self, entry_id: str, coordinator) -> BrowseMediaSource:
+        """List the last MEDIA_BROWSE_DAYS days of a terminal, newest first."""
+        children = []
+        # Without FileManager the event images can't be downloaded
+        if coordinator.client.supports(CAPABILITY_FILE_MANAGER):
+            today = dt_util.now().date()
+            for days_ago in range(MEDIA_BROWSE_DAYS):
+                day = (today - timedelta(days=days_ago)).strftime(DAY_FORMAT)
+                children.append(BrowseMediaSource(
+                    domain=DOMAIN,
+                    identifier=f"{entry_id}/{day}",
+                    media_class=MediaClass.DIRECTORY,
+                    media_content_type="",
+                    title=day,
+                    can_play=False,
+                    can_expand=True,
+                ))
+
+        return BrowseMediaSource(
+            domain=DOMAIN,
+            identifier=entry_id,
+            media_class=MediaClass.DIRECTORY,
+            media_content_type="",
+            title=coordinator.config_entry.title,
+            can_play=False,
+            can_expand=True,
+            children=children,
+            children_media_class=MediaClass.DIRECTORY,
+        )
+
+    async def _async_browse_day(
+        self, entry_id: str, coordinator, day: str, day_start: datetime
+    ) -> BrowseMediaSource:
+        """List the events of a day that have an image, newest first.
+
+        The day is paged through recordFinder; only the newest
+        MEDIA_BROWSE_MAX_EVENTS events with an image are kept.
+        """
+        start_time = int(day_start.timestamp())
+        end_time = int((day_start + timedelta(days=1)).timestamp()) - 1
+        events: deque = deque(maxlen=MEDIA_BROWSE_MAX_EVENTS)
+        try:
+            async for page in coordinator.client.iter_event_pages(start_time, end_time):
+                events.extend(event for event in page if event.get("URL"))
+        except Exception as err:
+            raise Unresolvable(f"Could not read the history of {day}: {err}") from err
+
+        children = []
+        for event in reversed(events):
+            file_path = event["URL"]
+            if not _is_event_image(file_path):
+                continue
+            url = _image_url(entry_id, file_path)
+            children.append(BrowseMediaSource(
+                domain=DOMAIN,
+                identifier=f"{entry_id}/image{file_path}",
+                media_class=MediaClass.IMAGE,
+                media_content_type="image/jpeg",
+                title=_event_title(event),
+                can_play=True,
+                can_expand=False,
+                thumbnail=f"{url}?thumbnail=1",
+            ))
+
+        return BrowseMediaSource(
+            domain=DOMAIN,
+            identifier=f"{entry_id}/{day}",
+            media_class=MediaClass.DIRECTORY,
+            media_content_type="",
+            title=day,
+            can_play=False,
+            can_expand=True,
+            children=children,
+            children_media_class=MediaClass.IMAGE,
+        )
+
+
+def _make_thumbnail(image: bytes) -> bytes:
+    """Downscale an image to a thumbnail; returns the image as-is without Pillow."""
+    try:
+        from PIL import Image
+    except ImportError:
+        return image
+
+    with Image.open(io.BytesIO(image)) as picture:
+        picture.thumbnail((MEDIA_THUMBNAIL_SIZE, MEDIA_THUMBNAIL_SIZE))
+        output = io.BytesIO()
+        picture.convert("RGB").save(output, format="JPEG", quality=80)
+        return output.getvalue()
+
+
+class IntelbrasEventImageView(HomeAssistantView):
+    """Serve event images by device file path, fetching them only on a cache miss.
+
+    Cached images are served even while the terminal is unloaded or offline.
+    """
+
+    url = f"/api/{DOMAIN}/event_image/{{entry_id}}/{{file_path:.+}}"
+    name = f"api:{DOMAIN}:event_image"
+    requires_auth = True
+
+    def __init__(self, hass: HomeAssistant, cache: IntelbrasMediaCache):
+        """Initialize the view."""
+        self.hass = hass
+        self.cache = cache
+
+    async def get(self, request: web.Request, entry_id: str, file_path: str) -> web.Response:
+        """Return the image, or its thumbnail, of an access event."""
+        entry = self.hass.config_entries.async_get_entry(entry_id)
+        file_path = f"/{file_path}"
+        if entry is None or entry.domain != DOMAIN or not _is_event_image(file_path):
+            raise web.HTTPNotFound()
+
+        thumbnail = "thumbnail" in request.query
+        image = await self._async_get_image(entry, file_path, thumbnail)
+        if image is None:
+            raise web.HTTPNotFound()
+        return web.Response(body=image, content_type="image/jpeg")
+
+    async def _async_get_image(self, entry, file_name: str, thumbnail: bool) -> Optional[bytes]:
+        """Return an image from the cache, downloading it from the device on a miss."""
+        host = entry.data.get(CONF_HOST)
+        key = f"{host}{file_name}:{'thumbnail' if thumbnail else 'image'}"
+        cached = await self.hass.async_add_executor_job(self.cache.get, key)
+        if cached is not None:
+            return cached
+
+        if thumbnail:
+            image = await self._async_get_image(entry, file_name, False)
+            if image is None:
+                return None
+            data = await self.hass.async_add_executor_job(_make_thumbnail, image)
+        else:
+            coordinator = _get_coordinator(self.hass, entry.entry_id)
+            if coordinator is None or not coordinator.client.supports(CAPABILITY_FILE_MANAGER):
+                return None
+            try:
+                data = await coordinator.client.download_image(file_name)
+            except Exception as err:
+                _LOGGER.warning("Could not download event image %s: %s", file_name, err)
+                return None
+
+        await self.hass.async_add_executor_job(self.cache.put, key, data)
+        return data
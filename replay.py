@@ -0,0 +1,239 @@
+"""Replay captured device traffic through the parser and coordinator.
+
+Feeds a fixture recorded with the start_capture service through
+IntelbrasEventParser and IntelbrasEventsCoordinator at an accelerated pace
+and reports memory growth, per-poll latency and dedupe correctness.
+
+    python -m custom_components.intelbras_3542mfw.replay fixture.jsonl --speed 100 --hours 6
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import re
+import statistics
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_EVENT_SCAN_INTERVAL, CONF_HOST, DOMAIN
+from .coordinator import IntelbrasEventsCoordinator
+from .event_parser import IntelbrasEventParser
+
+_LOGGER = logging.getLogger(__name__)
+
+REC_NO_PATTERN = re.compile(r'^(records\[\d+\]\.RecNo=)(\d+)$', re.MULTILINE)
+CREATE_TIME_PATTERN = re.compile(r'^(records\[\d+\]\.CreateTime=)(\d+)$', re.MULTILINE)
+
+
+def load_fixture(path: str) -> Dict[str, List[str]]:
+    """Load the recorded event and door status responses of a fixture file."""
+    responses = {"events": [], "door_status": []}
+    with open(path, encoding="utf-8") as fixture:
+        for line in fixture:
+            entry = json.loads(line)
+            if "body" not in entry:
+                continue
+            if "recordFinder.cgi" in entry["endpoint"]:
+                responses["events"].append(entry["body"])
+            elif "getDoorStatus" in entry["endpoint"]:
+                responses["door_status"].append(entry["body"])
+    return responses
+
+
+def shift_records(body: str, rec_offset: int, time_offset: int) -> str:
+    """Shift RecNo and CreateTime so a replayed page holds new records."""
+    body = REC_NO_PATTERN.sub(lambda m: f"{m.group(1)}{int(m.group(2)) + rec_offset}", body)
+    return CREATE_TIME_PATTERN.sub(lambda m: f"{m.group(1)}{int(m.group(2)) + time_offset}", body)
+
+
+class ReplayClock:
+    """Virtual device clock advanced by the replay driver."""
+
+    has_estimate = True
+    needs_sample = False
+
+    def __init__(self, start: int):
+        self.now = start
+        self.rtt = 0.0
+
+    def device_time(self) -> int:
+        return self.now
+
+
+class ReplayClient:
+    """Serve recorded responses in place of IntelbrasClient.
+
+    Event pages are served in recorded order. Each further pass through the
+    fixture shifts RecNo and CreateTime past the previous pass, so the
+    coordinator always sees new records.
+    """
+
+    def __init__(self, responses: Dict[str, List[str]]):
+        if not responses["events"]:
+            raise ValueError("Fixture has no recordFinder responses")
+        self._events = responses["events"]
+        self._door_status = responses["door_status"] or ["Info.status=Close"]
+        self._served = 0
+        self._door_served = 0
+
+        parser = IntelbrasEventParser(strict_mode=False)
+        rec_nos, create_times = [0], []
+        for body in self._events:
+            for record in parser.parse(body):
+                if isinstance(record.get("RecNo"), int):
+                    rec_nos.append(record["RecNo"])
+                if isinstance(record.get("CreateTime"), int):
+                    create_times.append(record["CreateTime"])
+        self._rec_span = max(rec_nos) + 1
+        self._time_span = (max(create_times) - min(create_times) + 1) if create_times else 0
+        self.clock = ReplayClock(min(create_times) if create_times else int(time.time()))
+        self.served_records: List[Dict[str, Any]] = []
+        self._parser = parser
+
+    def supports(self, capability: str) -> bool:
+        return True
+
+    async def sync_clock(self) -> None:
+        return None
+
+    async def get_events(self, start_time: int, end_time: int, count=None, conditions=None) -> str:
+        cycle, index = divmod(self._served, len(self._events))
+        self._served += 1
+        body = shift_records(
+            self._events[index], cycle * self._rec_span, cycle * self._time_span
+        )
+        self.served_records.extend(self._parser.parse(body))
+        return body
+
+    async def get_users(self, user_ids) -> List[Dict[str, Any]]:
+        # Fixtures carry no user directory; every user is a cached miss
+        return []
+
+    async def get_door_statuses(self, channels) -> Dict[int, str]:
+        body = self._door_status[self._door_served % len(self._door_status)]
+        self._door_served += 1
+        status = body.split("=", 1)[1].strip().lower() if "=" in body else body
+        return {channel: status for channel in channels}
+
+
+class ReplayConfigEntry:
+    """Minimal stand-in for the config entry the coordinator reads."""
+
+    entry_id = "replay"
+    title = "replay"
+    pref_disable_polling = False
+
+    def __init__(self, scan_interval: int):
+        self.data = {CONF_HOST: "replay", CONF_EVENT_SCAN_INTERVAL: scan_interval}
+        self.options = {}
+
+    def async_on_unload(self, func) -> None:
+        return None
+
+    def async_create_background_task(self, hass, target, name, eager_start=True):
+        return hass.async_create_background_task(target, name)
+
+
+def _record_key(record: Dict[str, Any]):
+    return (record.get("RecNo"), record.get("CreateTime"))
+
+
+async def async_replay(
+    fixture_path: str,
+    speed: float,
+    hours: float,
+    scan_interval: int,
+    report_every: int,
+    config_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Replay a fixture and return the soak test report."""
+    hass = HomeAssistant(config_dir or tempfile.mkdtemp())
+    client = ReplayClient(load_fixture(fixture_path))
+    coordinator = IntelbrasEventsCoordinator(hass, ReplayConfigEntry(scan_interval), client)
+    coordinator.last_updated = client.clock.now - 1
+
+    fired = Counter()
+    hass.bus.async_listen(
+        f"{DOMAIN}_event", lambda event: fired.update([_record_key(event.data)])
+    )
+
+    polls = int(hours * 3600 / scan_interval)
+    latencies = []
+    # loop_block_time covers only the last poll, so keep the worst seen
+    peak_loop_block = 0.0
+    failures = 0
+    tracemalloc.start()
+    baseline = None
+    memory = []
+
+    for poll in range(1, polls + 1):
+        client.clock.now += scan_interval
+        started = time.perf_counter()
+        await coordinator.async_refresh()
+        latencies.append(time.perf_counter() - started)
+        peak_loop_block = max(peak_loop_block, coordinator.loop_block_time)
+        if not coordinator.last_update_success:
+            failures += 1
+
+        if poll % report_every == 0 or poll == polls:
+            await hass.async_block_till_done()
+            current, _peak = tracemalloc.get_traced_memory()
+            if baseline is None:
+                # The first report is the warm-up baseline
+                baseline = current
+            memory.append(current)
+            _LOGGER.info(
+                "Poll %d/%d: %.1f KiB traced (%+.1f KiB), last poll %.1f ms",
+                poll, polls, current / 1024, (current - baseline) / 1024, latencies[-1] * 1000,
+            )
+        await asyncio.sleep(scan_interval / speed)
+
+    await hass.async_block_till_done()
+    tracemalloc.stop()
+
+    expected = Counter(_record_key(record) for record in client.served_records)
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    return {
+        "polls": polls,
+        "failed_polls": failures,
+        "records_served": len(client.served_records),
+        "unique_records": len(expected),
+        "events_fired": sum(fired.values()),
+        "duplicates_fired": sum(count - 1 for count in fired.values() if count > 1),
+        "missed_records": len(set(expected) - set(fired)),
+        "poll_latency_ms": {
+            "p50": statistics.median(latencies_ms),
+            "p95": latencies_ms[int(len(latencies_ms) * 0.95) - 1] if len(latencies_ms) > 1 else latencies_ms[0],
+            "max": latencies_ms[-1],
+        },
+        "memory_growth_kib": (memory[-1] - baseline) / 1024 if memory else 0.0,
+        "peak_loop_block_ms": peak_loop_block * 1000,
+    }
+
+
+def main() -> None:
+    """Run the replay from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("fixture", help="Fixture file recorded with the start_capture service")
+    parser.add_argument("--speed", type=float, default=100, help="Replay speed-up factor")
+    parser.add_argument("--hours", type=float, default=1, help="Simulated duration in hours")
+    parser.add_argument("--scan-interval", type=int, default=30, help="Simulated poll interval in seconds")
+    parser.add_argument("--report-every", type=int, default=100, help="Polls between memory reports")
+    parser.add_argument("--config-dir", help="Home Assistant config dir (default: a temporary one)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    report = asyncio.run(async_replay(
+        args.fixture, args.speed, args.hours, args.scan_interval, args.report_every, args.config_dir
+    ))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
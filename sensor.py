@@ -1,14 +1,16 @@
 import logging
 from datetime import timedelta
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
+from homeassistant.const import EntityCategory, UnitOfTime
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN, CONF_HOST, DEFAULT_HOST
+from .coordinator import get_device_link
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,6 +20,16 @@ ENTRY_METHOD_LABELS = {
 }
 
 
+def _channel_name(name: str, channel: int) -> str:
+    """Return the entity name for a door channel; channel 1 keeps the plain name."""
+    return name if channel == 1 else f"{name} {channel}"
+
+
+def _channel_unique_id(unique_id: str, channel: int) -> str:
+    """Return the unique id for a door channel; channel 1 keeps the original id."""
+    return unique_id if channel == 1 else f"{unique_id}_{channel}"
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -32,33 +44,63 @@ async def async_setup_entry(
 
     # Create sensor entities using the coordinator
     entities = [
-        IntelbrasDoorStatusSensor(coordinator, host),
         IntelbrasLastEventSensor(coordinator, host),
-        IntelbrasDoorEntryMethodSensor(coordinator, host)
+        IntelbrasRoundTripTimeSensor(coordinator, host),
+        IntelbrasProbeFailuresSensor(coordinator, host),
+        IntelbrasLoopBlockTimeSensor(coordinator, host),
     ]
+    for channel in coordinator.channels:
+        entities.append(IntelbrasDoorStatusSensor(coordinator, host, channel))
+        entities.append(IntelbrasDoorEntryMethodSensor(coordinator, host, channel))
+
+    # No update before add: the coordinator refreshes on its own, and waiting
+    # for it here would hold up startup on a slow terminal
+    async_add_entities(entities)
 
-    async_add_entities(entities, True)
 
+class IntelbrasRestoredSensor(CoordinatorEntity, SensorEntity, RestoreEntity):
+    """Base for sensors that show their restored state until the first refresh."""
+
+    _restored_state = None
+
+    async def async_added_to_hass(self) -> None:
+        """Restore last state after restart."""
+        await super().async_added_to_hass()
+
+        last_state = await self.async_get_last_state()
+        if last_state is not None and last_state.state not in ("unknown", "unavailable"):
+            self._restored_state = last_state.state
+
+    @property
+    def available(self) -> bool:
+        """Unavailable as soon as the probe finds the device offline."""
+        return super().available and self.coordinator.device_available
+
+    @property
+    def state(self):
+        """Return the restored state until the coordinator has data."""
+        if self.coordinator.data is None:
+            return self._restored_state
+        return self._coordinator_state()
 
-class IntelbrasDoorStatusSensor(CoordinatorEntity, SensorEntity):
+    def _coordinator_state(self):
+        """Return the state computed from the coordinator data."""
+        raise NotImplementedError
+
+
+class IntelbrasDoorStatusSensor(IntelbrasRestoredSensor):
     """Representation of the Intelbras door status sensor."""
 
-    def __init__(self, coordinator, host):
+    def __init__(self, coordinator, host, channel: int = 1):
         """Initialize the sensor."""
         super().__init__(coordinator)
-        self._attr_name = "Door Status"
-        self._attr_unique_id = f"{host}_door_status"
+        self._channel = channel
+        self._attr_name = _channel_name("Door Status", channel)
+        self._attr_unique_id = _channel_unique_id(f"{host}_door_status", channel)
         self._attr_icon = "mdi:door-closed-lock"
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, host)},
-            "name": "Intelbras 3542 MFW",
-            "manufacturer": "Intelbras",
-            "model": "3542 MFW",
-            "configuration_url": host,
-        }
+        self._attr_device_info = get_device_link(host)
 
-    @property
-    def state(self):
+    def _coordinator_state(self):
         """Return the door status."""
         # This state is a little tricky, we need to get the door status from the coordinator
         # first we check if the door status is in the coordinator data is open
@@ -66,7 +108,7 @@ class IntelbrasDoorStatusSensor(CoordinatorEntity, SensorEntity):
         # if it is not, we check if we have an event Type = Entry in the last update
         # if we have an event Type = Entry in the last update, we return open
         # else we return closed
-        door_status = self.coordinator.get_door_status()
+        door_status = self.coordinator.get_door_status(self._channel)
 
         # Fast return if the door status is open
         if door_status == "open":
@@ -75,7 +117,7 @@ class IntelbrasDoorStatusSensor(CoordinatorEntity, SensorEntity):
         # If the door status is not open, we check if we have an event Type = Entry in the last update
         # as the door status can be changed too fast for the coordinator to detect it,
         # so we get events in defined intervals, if a door was opened and closed in the last interval we set it manually as open.
-        events = self.coordinator.get_latest_events()
+        events = self.coordinator.get_latest_events(self._channel)
 
         if events:
             for event in events:
@@ -86,27 +128,21 @@ class IntelbrasDoorStatusSensor(CoordinatorEntity, SensorEntity):
         return "closed"
 
 
-class IntelbrasDoorEntryMethodSensor(CoordinatorEntity, SensorEntity):
+class IntelbrasDoorEntryMethodSensor(IntelbrasRestoredSensor):
     """Representation of the Intelbras door entry method sensor."""
 
-    def __init__(self, coordinator, host):
+    def __init__(self, coordinator, host, channel: int = 1):
         """Initialize the sensor."""
         super().__init__(coordinator)
-        self._attr_name = "Door Entry Method"
-        self._attr_unique_id = f"{host}_door_entry_method"
+        self._channel = channel
+        self._attr_name = _channel_name("Door Entry Method", channel)
+        self._attr_unique_id = _channel_unique_id(f"{host}_door_entry_method", channel)
         self._attr_icon = "mdi:lock-open-alert"
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, host)},
-            "name": "Intelbras 3542 MFW",
-            "manufacturer": "Intelbras",
-            "model": "3542 MFW",
-            "configuration_url": host,
-        }
+        self._attr_device_info = get_device_link(host)
 
-    @property
-    def state(self):
+    def _coordinator_state(self):
         """Return the door entry method."""
-        events = self.coordinator.get_latest_events()
+        events = self.coordinator.get_latest_events(self._channel)
         if events:
             for event in events:
                 # We only show the entry method if the event is an entry and the error code is 0
@@ -125,13 +161,7 @@ class IntelbrasLastEventSensor(CoordinatorEntity, SensorEntity, RestoreEntity):
         self._attr_unique_id = f"{host}_last_event"
         self._attr_icon = "mdi:history"
         self._last_known_state = None  # Store the last known state
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, host)},
-            "name": "Intelbras 3542 MFW",
-            "manufacturer": "Intelbras",
-            "model": "3542 MFW",
-            "configuration_url": host,
-        }
+        self._attr_device_info = get_device_link(host)
 
     async def async_added_to_hass(self) -> None:
         """Restore last state after restart."""
@@ -144,6 +174,11 @@ class IntelbrasLastEventSensor(CoordinatorEntity, SensorEntity, RestoreEntity):
             _LOGGER.debug(
                 f"Restored last known state: {self._last_known_state}")
 
+    @property
+    def available(self) -> bool:
+        """Unavailable as soon as the probe finds the device offline."""
+        return super().available and self.coordinator.device_available
+
     @property
     def state(self):
         """Return the timestamp of the last event."""
@@ -158,3 +193,95 @@ class IntelbrasLastEventSensor(CoordinatorEntity, SensorEntity, RestoreEntity):
 
         # Return the last known state if no new events are available
         return self._last_known_state
+
+
+class IntelbrasProbeSensor(SensorEntity):
+    """Base for diagnostic sensors updated by the availability probe.
+
+    These stay available while the device is offline, since reporting that
+    is their purpose.
+    """
+
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator, host):
+        """Initialize the sensor."""
+        self.coordinator = coordinator
+        self._attr_device_info = get_device_link(host)
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to probe results."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_probe_listener(self._handle_probe_update)
+        )
+
+    @callback
+    def _handle_probe_update(self) -> None:
+        """Write the new probe result."""
+        self.async_write_ha_state()
+
+
+class IntelbrasRoundTripTimeSensor(IntelbrasProbeSensor):
+    """Round-trip time of the last successful availability probe."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+
+    def __init__(self, coordinator, host):
+        """Initialize the sensor."""
+        super().__init__(coordinator, host)
+        self._attr_name = "Round Trip Time"
+        self._attr_unique_id = f"{host}_round_trip_time"
+        self._attr_icon = "mdi:timer-outline"
+
+    @property
+    def native_value(self):
+        """Return the probe round-trip time in milliseconds."""
+        if self.coordinator.probe_rtt is None:
+            return None
+        return round(self.coordinator.probe_rtt * 1000, 1)
+
+
+class IntelbrasProbeFailuresSensor(IntelbrasProbeSensor):
+    """Number of consecutive failed availability probes."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator, host):
+        """Initialize the sensor."""
+        super().__init__(coordinator, host)
+        self._attr_name = "Consecutive Probe Failures"
+        self._attr_unique_id = f"{host}_probe_failures"
+        self._attr_icon = "mdi:lan-disconnect"
+
+    @property
+    def native_value(self):
+        """Return the number of consecutive probe failures."""
+        return self.coordinator.probe_failures
+
+
+class IntelbrasLoopBlockTimeSensor(CoordinatorEntity, SensorEntity):
+    """Longest stretch the last event poll ran on the event loop without yielding."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+
+    def __init__(self, coordinator, host):
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_name = "Event Loop Block Time"
+        self._attr_unique_id = f"{host}_loop_block_time"
+        self._attr_icon = "mdi:timer-sand"
+        self._attr_device_info = get_device_link(host)
+
+    @property
+    def native_value(self):
+        """Return the longest on-loop stretch of the last poll in milliseconds."""
+        if not self.coordinator.data:
+            return None
+        return round(self.coordinator.data["loop_block_time"] * 1000, 2)
@@ -0,0 +1,292 @@
+import asyncio
+import logging
+import time
+
+import async_timeout
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    BULK_DOOR_MAX_CONCURRENCY,
+    BULK_DOOR_TIMEOUT,
+    DOOR_COMMAND_OPEN,
+    DOOR_COMMAND_STATUS,
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMAT_JSONL,
+)
+from .export import IntelbrasEventExporter
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_EXPORT_EVENTS = "export_events"
+SERVICE_IMPORT_STATISTICS = "import_statistics"
+SERVICE_START_CAPTURE = "start_capture"
+SERVICE_STOP_CAPTURE = "stop_capture"
+SERVICE_DOOR_COMMAND = "door_command"
+
+ATTR_ENTRY_ID = "entry_id"
+ATTR_FILENAME = "filename"
+ATTR_START_TIME = "start_time"
+ATTR_END_TIME = "end_time"
+ATTR_FORMAT = "format"
+ATTR_PAGE_SIZE = "page_size"
+ATTR_RESUME = "resume"
+ATTR_COMMAND = "command"
+ATTR_CHANNELS = "channels"
+ATTR_MAX_CONCURRENCY = "max_concurrency"
+ATTR_TIMEOUT = "timeout"
+
+EXPORT_EVENTS_SCHEMA = vol.Schema({
+    vol.Required(ATTR_ENTRY_ID): cv.string,
+    vol.Required(ATTR_FILENAME): cv.string,
+    vol.Required(ATTR_START_TIME): cv.datetime,
+    vol.Optional(ATTR_END_TIME): cv.datetime,
+    vol.Optional(ATTR_FORMAT, default=EXPORT_FORMAT_CSV): vol.In([EXPORT_FORMAT_CSV, EXPORT_FORMAT_JSONL]),
+    vol.Optional(ATTR_PAGE_SIZE): vol.All(vol.Coerce(int), vol.Range(min=10, max=1000)),
+    vol.Optional(ATTR_RESUME, default=False): cv.boolean,
+})
+
+IMPORT_STATISTICS_SCHEMA = vol.Schema({
+    vol.Required(ATTR_ENTRY_ID): cv.string,
+    vol.Required(ATTR_START_TIME): cv.datetime,
+})
+
+START_CAPTURE_SCHEMA = vol.Schema({
+    vol.Required(ATTR_ENTRY_ID): cv.string,
+    vol.Required(ATTR_FILENAME): cv.string,
+})
+
+STOP_CAPTURE_SCHEMA = vol.Schema({
+    vol.Required(ATTR_ENTRY_ID): cv.string,
+})
+
+DOOR_COMMAND_SCHEMA = vol.Schema({
+    vol.Required(ATTR_COMMAND): vol.In([DOOR_COMMAND_OPEN, DOOR_COMMAND_STATUS]),
+    vol.Optional(ATTR_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_CHANNELS): vol.All(cv.ensure_list, [vol.All(vol.Coerce(int), vol.Range(min=1))]),
+    vol.Optional(ATTR_MAX_CONCURRENCY, default=BULK_DOOR_MAX_CONCURRENCY): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+    vol.Optional(ATTR_TIMEOUT, default=BULK_DOOR_TIMEOUT): vol.All(vol.Coerce(float), vol.Range(min=1, max=60)),
+})
+
+
+def _get_entry_data(hass: HomeAssistant, entry_id: str) -> dict:
+    """Return the hass.data of a loaded config entry."""
+    entry_data = hass.data.get(DOMAIN, {}).get(entry_id)
+    if entry_data is None:
+        raise HomeAssistantError(f"Intelbras 3542 MFW entry {entry_id} is not loaded")
+    return entry_data
+
+
+async def _async_door_command(
+    hass: HomeAssistant,
+    entry_id: str,
+    channel: int,
+    command: str,
+    timeout: float,
+    slots: asyncio.Semaphore,
+) -> dict:
+    """Run one door command for a bulk request and report its outcome.
+
+    Offline terminals are reported right away instead of waiting for the
+    timeout. Successful commands update the coordinator like the door
+    button and door status sensor would. An openDoor command is shielded
+    in the client and keeps running after the timeout, so a timed out open
+    is reported as timed_out: the door may still open.
+    """
+    entry_data = hass.data[DOMAIN][entry_id]
+    coordinator = entry_data["coordinator"]
+    client = entry_data["client"]
+    result = {
+        "entry_id": entry_id,
+        "terminal": coordinator.config_entry.title,
+        "channel": channel,
+        "success": False,
+        "timed_out": False,
+    }
+    if not coordinator.device_available:
+        result["error"] = "Device is offline"
+        return result
+
+    async with slots:
+        started = time.monotonic()
+        try:
+            async with async_timeout.timeout(timeout):
+                if command == DOOR_COMMAND_OPEN:
+                    await client.open_door(channel)
+                    status = "open"
+                else:
+                    status = await client.get_door_status(channel)
+        except asyncio.TimeoutError:
+            result["timed_out"] = True
+            result["error"] = f"No response within {timeout}s"
+            if command == DOOR_COMMAND_OPEN:
+                result["error"] += "; the command is still running and the door may still open"
+                coordinator.config_entry.async_create_background_task(
+                    hass, coordinator.async_recheck_door_status(channel), f"{DOMAIN} door status re-check"
+                )
+        except Exception as err:
+            result["error"] = str(err) or type(err).__name__
+        else:
+            result["success"] = True
+            result["status"] = status
+            coordinator.async_set_door_status(status, channel)
+            if command == DOOR_COMMAND_OPEN:
+                coordinator.config_entry.async_create_background_task(
+                    hass, coordinator.async_recheck_door_status(channel), f"{DOMAIN} door status re-check"
+                )
+        result["elapsed"] = round(time.monotonic() - started, 3)
+    return result
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services."""
+
+    running_exports: set = set()
+
+    async def async_export_events(call: ServiceCall) -> None:
+        """Start exporting the access record history of a terminal to a file.
+
+        The export runs as a background task of the entry; the call returns
+        once it has started and completion is reported through events.
+        """
+        entry_id = call.data[ATTR_ENTRY_ID]
+        filename = call.data[ATTR_FILENAME]
+        client = _get_entry_data(hass, entry_id)["client"]
+        if not hass.config.is_allowed_path(filename):
+            raise HomeAssistantError(f"Cannot write to {filename}, it is not an allowed path")
+        if filename in running_exports:
+            raise HomeAssistantError(f"An export to {filename} is already running")
+
+        start_time = int(dt_util.as_timestamp(call.data[ATTR_START_TIME]))
+        end_time = int(dt_util.as_timestamp(call.data.get(ATTR_END_TIME, dt_util.now())))
+
+        def report_progress(exported: int, create_time) -> None:
+            hass.bus.async_fire(f"{DOMAIN}_export_progress", {
+                "entry_id": entry_id,
+                "filename": filename,
+                "exported": exported,
+                "last_create_time": create_time,
+            })
+
+        exporter = IntelbrasEventExporter(
+            hass,
+            client,
+            filename,
+            call.data[ATTR_FORMAT],
+            call.data.get(ATTR_PAGE_SIZE),
+            report_progress,
+        )
+
+        async def async_run_export() -> None:
+            finished = {"entry_id": entry_id, "filename": filename}
+            try:
+                finished["exported"] = await exporter.async_export(
+                    start_time, end_time, call.data[ATTR_RESUME]
+                )
+            except Exception as err:
+                _LOGGER.error("Export to %s failed: %s", filename, err)
+                finished["error"] = str(err) or type(err).__name__
+            finally:
+                running_exports.discard(filename)
+            hass.bus.async_fire(f"{DOMAIN}_export_finished", finished)
+
+        running_exports.add(filename)
+        hass.config_entries.async_get_entry(entry_id).async_create_background_task(
+            hass, async_run_export(), f"{DOMAIN} export to {filename}"
+        )
+
+    async def async_import_statistics(call: ServiceCall) -> None:
+        """Backfill the hourly access statistics of a terminal from its history."""
+        entry_data = _get_entry_data(hass, call.data[ATTR_ENTRY_ID])
+        coordinator = entry_data["coordinator"]
+        start_time = int(dt_util.as_timestamp(call.data[ATTR_START_TIME]))
+        try:
+            await coordinator.statistics.async_backfill(
+                entry_data["client"], start_time, coordinator.event_conditions
+            )
+        except RuntimeError as err:
+            raise HomeAssistantError(str(err)) from err
+
+    async def async_start_capture(call: ServiceCall) -> None:
+        """Record the device traffic of a terminal to a replay fixture."""
+        filename = call.data[ATTR_FILENAME]
+        client = _get_entry_data(hass, call.data[ATTR_ENTRY_ID])["client"]
+        if not hass.config.is_allowed_path(filename):
+            raise HomeAssistantError(f"Cannot write to {filename}, it is not an allowed path")
+        try:
+            await client.start_capture(filename)
+        except OSError as err:
+            raise HomeAssistantError(f"Cannot open {filename}: {err}") from err
+
+    async def async_stop_capture(call: ServiceCall) -> None:
+        """Stop recording the device traffic of a terminal."""
+        client = _get_entry_data(hass, call.data[ATTR_ENTRY_ID])["client"]
+        await client.stop_capture()
+
+    async def async_door_command(call: ServiceCall) -> ServiceResponse:
+        """Open or query many doors across terminals at once.
+
+        Targets every loaded terminal and every door channel unless narrowed
+        down by entry_id and channels. Commands run concurrently, at most
+        max_concurrency at a time, so the call takes about as long as the
+        slowest door rather than the sum of all of them.
+        """
+        loaded = hass.data.get(DOMAIN, {})
+        entry_ids = call.data.get(ATTR_ENTRY_ID) or list(loaded)
+        for entry_id in entry_ids:
+            _get_entry_data(hass, entry_id)
+
+        requested_channels = call.data.get(ATTR_CHANNELS)
+        targets = [
+            (entry_id, channel)
+            for entry_id in entry_ids
+            for channel in loaded[entry_id]["coordinator"].channels
+            if requested_channels is None or channel in requested_channels
+        ]
+
+        started = time.monotonic()
+        slots = asyncio.Semaphore(call.data[ATTR_MAX_CONCURRENCY])
+        results = await asyncio.gather(*(
+            _async_door_command(
+                hass, entry_id, channel, call.data[ATTR_COMMAND], call.data[ATTR_TIMEOUT], slots
+            )
+            for entry_id, channel in targets
+        ))
+        failed = sum(1 for result in results if not result["success"])
+        timed_out = sum(1 for result in results if result["timed_out"])
+        if failed:
+            _LOGGER.warning("Bulk door %s failed for %d of %d doors (%d timed out)",
+                            call.data[ATTR_COMMAND], failed, len(results), timed_out)
+        return {
+            "command": call.data[ATTR_COMMAND],
+            "succeeded": len(results) - failed,
+            "failed": failed,
+            "timed_out": timed_out,
+            "elapsed": round(time.monotonic() - started, 3),
+            "results": list(results),
+        }
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_EXPORT_EVENTS, async_export_events, schema=EXPORT_EVENTS_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_IMPORT_STATISTICS, async_import_statistics, schema=IMPORT_STATISTICS_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_START_CAPTURE, async_start_capture, schema=START_CAPTURE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_STOP_CAPTURE, async_stop_capture, schema=STOP_CAPTURE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DOOR_COMMAND,
+        async_door_command,
+        schema=DOOR_COMMAND_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
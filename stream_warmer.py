@@ -0,0 +1,64 @@
+import logging
+import time
+from typing import Dict
+
+from homeassistant.components.camera import Camera
+from homeassistant.components.stream.const import HLS_PROVIDER
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import DATA_STREAM_WARMER, STREAM_PREWARM_MAX_STREAMS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def get_stream_warmer(hass: HomeAssistant) -> "IntelbrasStreamWarmer":
+    """Return the stream warmer shared by all terminals."""
+    if DATA_STREAM_WARMER not in hass.data:
+        hass.data[DATA_STREAM_WARMER] = IntelbrasStreamWarmer(STREAM_PREWARM_MAX_STREAMS)
+    return hass.data[DATA_STREAM_WARMER]
+
+
+class IntelbrasStreamWarmer:
+    """Start camera streams ahead of live view and hold them for a window.
+
+    The hold is the idle timeout of the stream's HLS output: Home Assistant
+    stops the output, and with it the stream worker, once nobody has
+    requested a segment for that long. A viewer opening the camera keeps it
+    running as usual. Warming an already warm camera restarts its window.
+
+    The warmer is shared by all terminals, so at most max_streams streams
+    are held at once. When the cap is reached, further events are not
+    warmed; a stream that may already be watched is never cut short.
+    """
+
+    def __init__(self, max_streams: int):
+        """Initialize the warmer."""
+        self.max_streams = max_streams
+        # entity_id -> monotonic time its window ends
+        self._warm: Dict[str, float] = {}
+
+    async def async_warm(self, camera: Camera, window: int) -> bool:
+        """Start or extend the stream of camera for window seconds; returns if it is warm."""
+        now = time.monotonic()
+        self._warm = {entity_id: ends for entity_id, ends in self._warm.items() if ends > now}
+        if camera.entity_id not in self._warm and len(self._warm) >= self.max_streams:
+            _LOGGER.debug("Not warming %s, %d streams are already warm",
+                          camera.entity_id, len(self._warm))
+            return False
+
+        self._warm[camera.entity_id] = now + window
+        try:
+            stream = await camera.async_create_stream()
+            if stream is None:
+                raise HomeAssistantError("camera has no stream source")
+            provider = stream.add_provider(HLS_PROVIDER, timeout=window)
+            provider.idle_timer.awake()
+            await stream.start()
+        except HomeAssistantError as err:
+            _LOGGER.debug("Could not warm the stream of %s: %s", camera.entity_id, err)
+            self._warm.pop(camera.entity_id, None)
+            return False
+
+        _LOGGER.debug("Warmed the stream of %s for %ss", camera.entity_id, window)
+        return True
@@ -0,0 +1,158 @@
+import logging
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+
+from .const import (
+    CAPABILITY_ACCESS_USER,
+    USER_DIRECTORY_BATCH_SIZE,
+    USER_DIRECTORY_MISS_TTL,
+    USER_DIRECTORY_TTL,
+    USER_TYPES,
+)
+
+logger = logging.getLogger(__name__)
+
+# Lines like "Info[0].UserName=John" (doFind) or "UserList[0].UserName=John" (list);
+# nested array fields such as "Info[0].Doors[0]=0" are not needed and don't match
+USER_LINE_PATTERN = re.compile(r'^\w+\[(\d+)\]\.(\w+)=(.*)$')
+
+
+def parse_user_records(raw_data: str) -> List[Dict[str, Any]]:
+    """
+    Parse an AccessUser doFind or list response into user records.
+
+    Args:
+        raw_data: Raw response text
+
+    Returns:
+        List of user records, in response order, with UserType as int
+    """
+    users: Dict[int, Dict[str, Any]] = {}
+    if not isinstance(raw_data, str):
+        return []
+
+    for line in raw_data.splitlines():
+        match = USER_LINE_PATTERN.match(line.strip())
+        if not match:
+            continue
+        index, key, value = int(match.group(1)), match.group(2), match.group(3).strip()
+        if key == "UserType" and value.isdigit():
+            users.setdefault(index, {})[key] = int(value)
+        else:
+            users.setdefault(index, {})[key] = value
+    return [users[index] for index in sorted(users) if users[index].get("UserID")]
+
+
+class IntelbrasUserDirectory:
+    """
+    Cache of the users stored on the device, for enriching access events.
+
+    The directory is loaded in bulk at startup. After that, only UserIDs
+    seen in new events are looked up: unknown ones and those cached longer
+    than USER_DIRECTORY_TTL are fetched together in AccessUser list
+    requests of up to USER_DIRECTORY_BATCH_SIZE ids, so firing an event
+    never costs a request of its own. UserIDs the device doesn't know are
+    remembered for USER_DIRECTORY_MISS_TTL.
+    """
+
+    def __init__(self):
+        """Initialize an empty directory."""
+        # UserID -> (fetched_at, user record or None if the device doesn't know it)
+        self._users: Dict[str, Tuple[float, Optional[Dict[str, Any]]]] = {}
+        self.loaded = False
+        # Cleared when the firmware has no AccessUser API
+        self.supported = True
+
+    def __len__(self) -> int:
+        return sum(1 for _fetched_at, user in self._users.values() if user is not None)
+
+    async def async_load(self, client) -> int:
+        """
+        Load every user from the device, replacing the cached ones.
+
+        Args:
+            client: IntelbrasClient of the device
+
+        Returns:
+            Number of users loaded
+        """
+        if not client.supports(CAPABILITY_ACCESS_USER):
+            logger.info("Device doesn't report the AccessUser capability, events won't be enriched")
+            self.supported = False
+            return 0
+
+        users = {}
+        now = time.monotonic()
+        try:
+            async for page in client.iter_users():
+                for user in page:
+                    users[str(user["UserID"])] = (now, user)
+        except aiohttp.ClientResponseError as e:
+            if e.status in (400, 404, 501):
+                logger.info(f"Device has no AccessUser API, events won't be enriched: {e}")
+                self.supported = False
+                return 0
+            raise
+
+        self._users = users
+        self.loaded = True
+        logger.debug(f"Loaded {len(users)} users from the device")
+        return len(users)
+
+    async def async_resolve(self, client, user_ids: Iterable[Any]) -> None:
+        """
+        Fetch the unknown and stale users among user_ids in batches.
+
+        Args:
+            client: IntelbrasClient of the device
+            user_ids: UserIDs of the events about to be fired
+        """
+        if not self.supported or not client.supports(CAPABILITY_ACCESS_USER):
+            return
+
+        now = time.monotonic()
+        pending = []
+        for user_id in {str(user_id) for user_id in user_ids if user_id not in (None, "")}:
+            cached = self._users.get(user_id)
+            ttl = USER_DIRECTORY_TTL if cached and cached[1] is not None else USER_DIRECTORY_MISS_TTL
+            if cached is None or now - cached[0] > ttl:
+                pending.append(user_id)
+
+        for start in range(0, len(pending), USER_DIRECTORY_BATCH_SIZE):
+            batch = pending[start:start + USER_DIRECTORY_BATCH_SIZE]
+            try:
+                found = {str(user["UserID"]): user for user in await client.get_users(batch)}
+            except Exception as e:
+                # Keep whatever is cached and retry on the next poll
+                logger.warning(f"Could not look up {len(batch)} users: {e}")
+                return
+            for user_id in batch:
+                self._users[user_id] = (now, found.get(user_id))
+            logger.debug(f"Resolved {len(found)} of {len(batch)} users")
+
+    def get(self, user_id: Any) -> Optional[Dict[str, Any]]:
+        """Return the cached user record of a UserID, if known."""
+        cached = self._users.get(str(user_id))
+        return cached[1] if cached else None
+
+    def enrich(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return the directory fields to add to an event.
+
+        Args:
+            event: Parsed access record
+
+        Returns:
+            user_name and user_group of the event's user, empty if unknown
+        """
+        user = self.get(event.get("UserID")) if event.get("UserID") else None
+        if user is None:
+            return {}
+        user_type = user.get("UserType")
+        return {
+            "user_name": user.get("UserName"),
+            "user_group": USER_TYPES.get(user_type, user_type),
+        }